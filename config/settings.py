@@ -1,36 +1,82 @@
 import os
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
 from dotenv import load_dotenv
 
-load_dotenv()
+_env_lock = threading.Lock()
+_env_loaded = False
 
-class Config:
+def _load_env():
+    """Parse the .env file once per process"""
+    global _env_loaded
+    with _env_lock:
+        if not _env_loaded:
+            load_dotenv()
+            _env_loaded = True
+
+@dataclass(frozen=True)
+class Settings:
     # Social Media APIs
-    TWITTER_BEARER_TOKEN = os.getenv('TWITTER_BEARER_TOKEN')
-    TWITTER_API_KEY = os.getenv('TWITTER_API_KEY')
-    TWITTER_API_SECRET = os.getenv('TWITTER_API_SECRET')
-    TWITTER_ACCESS_TOKEN = os.getenv('TWITTER_ACCESS_TOKEN')
-    TWITTER_ACCESS_TOKEN_SECRET = os.getenv('TWITTER_ACCESS_TOKEN_SECRET')
+    TWITTER_BEARER_TOKEN: Optional[str] = None
+    TWITTER_API_KEY: Optional[str] = None
+    TWITTER_API_SECRET: Optional[str] = None
+    TWITTER_ACCESS_TOKEN: Optional[str] = None
+    TWITTER_ACCESS_TOKEN_SECRET: Optional[str] = None
 
-    REDDIT_CLIENT_ID = os.getenv('REDDIT_CLIENT_ID')
-    REDDIT_CLIENT_SECRET = os.getenv('REDDIT_CLIENT_SECRET')
-    REDDIT_USER_AGENT = os.getenv('REDDIT_USER_AGENT', 'SentimentAnalysis/1.0')
+    REDDIT_CLIENT_ID: Optional[str] = None
+    REDDIT_CLIENT_SECRET: Optional[str] = None
+    REDDIT_USER_AGENT: str = 'SentimentAnalysis/1.0'
 
-    YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
+    YOUTUBE_API_KEY: Optional[str] = None
 
     # Database
-    MONGODB_URI = os.getenv('MONGODB_URI')
-    DATABASE_NAME = 'sentiment_analysis'
+    MONGODB_URI: Optional[str] = None
+    DATABASE_NAME: str = 'sentiment_analysis'
 
     # Flask
-    FLASK_ENV = os.getenv('FLASK_ENV', 'development')
-    FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
-    SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key')
-    FLASK_PORT = int(os.getenv('FLASK_PORT', 5001))  # Use port 5001 by default
+    FLASK_ENV: str = 'development'
+    FLASK_DEBUG: bool = True
+    SECRET_KEY: str = 'dev-secret-key'
+    FLASK_PORT: int = 5001  # Use port 5001 by default
+    ALLOWED_ORIGINS: Tuple[str, ...] = ('*',)  # CORS origins for /api/*
 
     # Processing Settings
-    BATCH_SIZE = 100
-    UPDATE_INTERVAL = 30  # seconds
-    MAX_POSTS_PER_DAY = 1000
+    BATCH_SIZE: int = 100
+    USE_ONNX_RUNTIME: bool = False  # run the sentiment model through onnxruntime when installed
+    DISABLE_MONITORING: bool = False  # turn PerformanceMonitor into a no-op (benchmarks, CI)
+    UPDATE_INTERVAL: int = 30  # seconds
+    MAX_POSTS_PER_DAY: int = 1000
 
     # Keywords to track
-    DEFAULT_KEYWORDS = ['python', 'AI', 'machine learning']
\ No newline at end of file
+    DEFAULT_KEYWORDS: Tuple[str, ...] = ('python', 'AI', 'machine learning')
+
+@lru_cache(maxsize=1)
+def get_config() -> Settings:
+    """Build the application settings once; later calls return the cached instance"""
+    _load_env()
+    env = os.environ
+
+    return Settings(
+        TWITTER_BEARER_TOKEN=env.get('TWITTER_BEARER_TOKEN'),
+        TWITTER_API_KEY=env.get('TWITTER_API_KEY'),
+        TWITTER_API_SECRET=env.get('TWITTER_API_SECRET'),
+        TWITTER_ACCESS_TOKEN=env.get('TWITTER_ACCESS_TOKEN'),
+        TWITTER_ACCESS_TOKEN_SECRET=env.get('TWITTER_ACCESS_TOKEN_SECRET'),
+        REDDIT_CLIENT_ID=env.get('REDDIT_CLIENT_ID'),
+        REDDIT_CLIENT_SECRET=env.get('REDDIT_CLIENT_SECRET'),
+        REDDIT_USER_AGENT=env.get('REDDIT_USER_AGENT', 'SentimentAnalysis/1.0'),
+        YOUTUBE_API_KEY=env.get('YOUTUBE_API_KEY'),
+        MONGODB_URI=env.get('MONGODB_URI'),
+        FLASK_ENV=env.get('FLASK_ENV', 'development'),
+        FLASK_DEBUG=env.get('FLASK_DEBUG', 'True').lower() == 'true',
+        SECRET_KEY=env.get('SECRET_KEY', 'dev-secret-key'),
+        FLASK_PORT=int(env.get('FLASK_PORT', 5001)),
+        ALLOWED_ORIGINS=tuple(origin.strip() for origin in env.get('ALLOWED_ORIGINS', '*').split(',')),
+        USE_ONNX_RUNTIME=env.get('USE_ONNX_RUNTIME', 'False').lower() == 'true',
+        DISABLE_MONITORING=env.get('DISABLE_MONITORING', 'False').lower() == 'true',
+    )
+
+# Module-level instance kept for existing `from config.settings import Config` imports
+Config = get_config()
@@ -16,7 +16,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.utils.logger import setup_logging, get_logger
 from src.utils.error_handler import error_handler
-from src.utils.monitoring import performance_monitor, ProcessingTimer
+from src.utils.monitoring import performance_monitor
 from src.streaming.real_time_pipeline import RealTimePipeline
 from src.dashboard.app import app
 from config.settings import Config
@@ -28,12 +28,16 @@ class SentimentAnalysisApp:
         self.dashboard_thread = None
         self.pipeline_thread = None
         self.is_running = False
+        self._stop_event = threading.Event()
 
     def run_dashboard_only(self):
         """Run only the web dashboard"""
         self.logger.info(f"Starting dashboard in standalone mode on port {Config.FLASK_PORT}...")
 
         try:
+            self._serve_gunicorn()
+        except ImportError:
+            self.logger.warning("gunicorn not available, falling back to Flask development server")
             app.run(
                 debug=Config.FLASK_DEBUG,
                 host='0.0.0.0',
@@ -44,6 +48,33 @@ class SentimentAnalysisApp:
             self.logger.error(f"Error running dashboard: {e}")
             error_handler.handle_processing_error("dashboard_startup", e)
 
+    def _serve_gunicorn(self):
+        """Serve the dashboard with gunicorn gthread workers"""
+        from gunicorn.app.base import BaseApplication
+
+        class DashboardApplication(BaseApplication):
+            def __init__(self, application, options=None):
+                self.options = options or {}
+                self.application = application
+                super().__init__()
+
+            def load_config(self):
+                for key, value in self.options.items():
+                    if key in self.cfg.settings and value is not None:
+                        self.cfg.set(key.lower(), value)
+
+            def load(self):
+                return self.application
+
+        options = {
+            'bind': f'0.0.0.0:{Config.FLASK_PORT}',
+            'workers': os.cpu_count() or 1,
+            'worker_class': 'gthread',
+            'threads': 8,  # Keep the per-worker thread pool modest
+            'preload_app': True  # Fork after imports so workers share them copy-on-write
+        }
+        DashboardApplication(app, options).run()
+
     def run_pipeline_only(self):
         """Run only the data collection pipeline"""
         self.logger.info("Starting data collection pipeline...")
@@ -64,6 +95,7 @@ class SentimentAnalysisApp:
         """Run both pipeline and dashboard"""
         self.logger.info("Starting full sentiment analysis system...")
         self.is_running = True
+        self._stop_event.clear()
 
         try:
             # Start dashboard in separate thread
@@ -120,39 +152,38 @@ class SentimentAnalysisApp:
         """Main monitoring loop"""
         self.logger.info("System monitoring started. Press Ctrl+C to stop.")
 
-        try:
-            while self.is_running:
-                with ProcessingTimer(performance_monitor, "health_check"):
-                    health = performance_monitor.check_system_health()
+        while self.is_running:
+            with performance_monitor.timer("health_check"):
+                health = performance_monitor.check_system_health()
 
-                    if health['status'] == 'critical':
-                        self.logger.warning(f"System health critical: {health['message']}")
-                        for issue in health['issues']:
-                            self.logger.warning(f"  - {issue}")
+                if health['status'] == 'critical':
+                    self.logger.warning(f"System health critical: {health['message']}")
+                    for issue in health['issues']:
+                        self.logger.warning(f"  - {issue}")
 
-                    elif health['status'] == 'warning':
-                        self.logger.info(f"System health warning: {health['message']}")
+                elif health['status'] == 'warning':
+                    self.logger.info(f"System health warning: {health['message']}")
 
-                # Log performance summary every 5 minutes
-                import time
-                time.sleep(300)  # 5 minutes
+            # Log performance summary every 5 minutes; a shutdown signal wakes the wait immediately
+            if self._stop_event.wait(300):
+                break
 
-                if self.is_running:
-                    summary = performance_monitor.get_performance_summary()
-                    self.logger.info(f"System uptime: {summary['uptime_formatted']}")
-                    self.logger.info(f"Total operations: {summary['total_operations']}")
+            summary = performance_monitor.get_performance_summary()
+            self.logger.info(f"System uptime: {summary['uptime_formatted']}")
+            self.logger.info(f"Total operations: {summary['total_operations']}")
 
-        except KeyboardInterrupt:
-            self.logger.info("Monitoring stopped by user")
+        self.logger.info("System monitoring stopped")
 
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals"""
         self.logger.info(f"Received signal {signum}, shutting down...")
-        self.stop_system()
+        self.is_running = False
+        self._stop_event.set()
 
     def stop_system(self):
         """Stop the entire system"""
         self.is_running = False
+        self._stop_event.set()
 
         if self.pipeline:
             self.logger.info("Stopping data collection pipeline...")
@@ -1,18 +1,110 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, stream_with_context
 from flask_cors import CORS
 from datetime import datetime, timedelta
+from dataclasses import dataclass
+from functools import wraps
+from itertools import chain
+from typing import Any, Optional
+from cachetools import TTLCache
+import threading
 import logging
 import json
+import orjson
 
 from src.database.mongodb_client import MongoDBClient
 from config.settings import Config
 
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
-CORS(app)
+# Only the JSON API needs CORS headers; the dashboard page and its assets are same-origin
+CORS(app, resources={r"/api/*": {"origins": Config.ALLOWED_ORIGINS}})
+# Serve /api/x and /api/x/ alike instead of answering with a redirect
+app.url_map.strict_slashes = False
 app.config['SECRET_KEY'] = Config.SECRET_KEY
 
-# Initialize database client
-db_client = MongoDBClient()
+# Database client is created on first use so startup and forking never wait on MongoDB
+_db_client = None
+_db_client_lock = threading.Lock()
+
+def get_db() -> MongoDBClient:
+    """Return the process-wide database client, creating it lazily"""
+    global _db_client
+    if _db_client is None:
+        with _db_client_lock:
+            if _db_client is None:
+                _db_client = MongoDBClient(connect=False)
+    return _db_client
+
+# Only the fields each posts endpoint serializes are fetched from MongoDB
+RECENT_POST_PROJECTION = {
+    'text': 1, 'title': 1, 'platform': 1, 'created_at': 1,
+    'author_id': 1, 'author': 1, 'likes': 1, 'retweets': 1, 'score': 1
+}
+TOP_POST_TEXT_LIMIT = 200
+TOP_POST_PROJECTION = {
+    'text': {'$substrCP': [{'$ifNull': ['$text', '']}, 0, TOP_POST_TEXT_LIMIT]},
+    'text_truncated': {'$gt': [{'$strLenCP': {'$ifNull': ['$text', '']}}, TOP_POST_TEXT_LIMIT]},
+    'platform': 1, 'sentiment': 1, 'created_at': 1, 'metadata': 1
+}
+
+def json_response(payload: dict):
+    """Serialize a payload with orjson (datetimes natively, ObjectIds via str)"""
+    return app.response_class(orjson.dumps(payload, default=str), mimetype='application/json')
+
+def ttl_cache(maxsize: int = 256, ttl: int = Config.UPDATE_INTERVAL):
+    """Cache successful JSON response bodies per request path for `ttl` seconds"""
+    def decorator(func):
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = request.full_path
+            with lock:
+                body = cache.get(key)
+
+            if body is None:
+                response = func(*args, **kwargs)
+                if isinstance(response, tuple):
+                    # Error responses carry a status code and are not cached
+                    return response
+                body = response.get_data()
+                with lock:
+                    cache[key] = body
+
+            response = app.response_class(body, mimetype='application/json')
+            response.headers['Cache-Control'] = f'public, max-age={ttl}'
+            return response
+
+        wrapper.cache = cache
+        wrapper.cache_lock = lock
+        return wrapper
+    return decorator
+
+def format_trends(trends: list) -> list:
+    """Flatten trend buckets for the frontend"""
+    return [
+        {
+            'date': item['_id']['date'],
+            'hour': item['_id']['hour'],
+            'sentiment': item['_id']['sentiment'],
+            'count': item['count']
+        }
+        for item in trends
+    ]
+
+def clean_top_post(post: dict) -> dict:
+    """Shape a top post for the frontend (text is already truncated by MongoDB)"""
+    text = post.get('text') or ''
+    return {
+        'id': post.get('_id'),
+        'text': text + '...' if post.get('text_truncated') else text,
+        'platform': post.get('platform'),
+        'sentiment': post.get('sentiment'),
+        'created_at': post.get('created_at'),
+        'metadata': post.get('metadata', {})
+    }
 
 @app.route('/')
 def dashboard():
@@ -20,51 +112,73 @@ def dashboard():
     return render_template('dashboard.html')
 
 @app.route('/api/sentiment/summary')
+@ttl_cache()
 def get_sentiment_summary():
     """Get current sentiment summary"""
     platform = request.args.get('platform')
     hours = int(request.args.get('hours', 24))
 
     try:
-        summary = db_client.get_sentiment_summary(platform=platform, hours=hours)
+        summary = get_db().get_sentiment_summary(platform=platform, hours=hours)
         return jsonify({
             'success': True,
             'data': summary,
             'timestamp': datetime.now().isoformat()
         })
     except Exception as e:
-        logging.error(f"Error getting sentiment summary: {e}")
+        logger.error("Error getting sentiment summary: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 @app.route('/api/sentiment/trends')
+@ttl_cache()
 def get_sentiment_trends():
     """Get sentiment trends over time"""
     platform = request.args.get('platform')
     days = int(request.args.get('days', 7))
 
     try:
-        trends = db_client.get_trend_data(platform=platform, days=days)
-
-        # Format data for frontend
-        formatted_trends = []
-        for item in trends:
-            formatted_trends.append({
-                'date': item['_id']['date'],
-                'hour': item['_id']['hour'],
-                'sentiment': item['_id']['sentiment'],
-                'count': item['count']
-            })
+        trends = get_db().get_trend_data(platform=platform, days=days)
 
         return jsonify({
             'success': True,
-            'data': formatted_trends,
+            'data': format_trends(trends),
             'timestamp': datetime.now().isoformat()
         })
     except Exception as e:
-        logging.error(f"Error getting sentiment trends: {e}")
+        logger.error("Error getting sentiment trends: %s", e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/dashboard/snapshot')
+@ttl_cache()
+def get_dashboard_snapshot():
+    """Get summary, trends and top posts in one request"""
+    platform = request.args.get('platform')
+    hours = int(request.args.get('hours', 24))
+    days = int(request.args.get('days', 7))
+    limit = int(request.args.get('limit', 10))
+
+    try:
+        snapshot = get_db().dashboard_snapshot(platform=platform, hours=hours, days=days, top_n=limit,
+                                               projection=TOP_POST_PROJECTION)
+
+        return json_response({
+            'success': True,
+            'data': {
+                'summary': snapshot['summary'],
+                'trends': format_trends(snapshot['trend']),
+                'top_positive': [clean_top_post(post) for post in snapshot['top_positive']],
+                'top_negative': [clean_top_post(post) for post in snapshot['top_negative']]
+            },
+            'timestamp': datetime.now().isoformat()
+        })
+    except Exception as e:
+        logger.error("Error getting dashboard snapshot: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -78,33 +192,51 @@ def get_top_posts():
     limit = int(request.args.get('limit', 10))
 
     try:
-        posts = db_client.get_top_posts(sentiment=sentiment, platform=platform, limit=limit)
-
-        # Clean up posts for frontend
-        cleaned_posts = []
-        for post in posts:
-            cleaned_post = {
-                'id': str(post.get('_id')),
-                'text': post.get('text', '')[:200] + '...' if len(post.get('text', '')) > 200 else post.get('text', ''),
-                'platform': post.get('platform'),
-                'sentiment': post.get('sentiment'),
-                'created_at': post.get('created_at').isoformat() if post.get('created_at') else None,
-                'metadata': post.get('metadata', {})
-            }
-            cleaned_posts.append(cleaned_post)
+        posts = get_db().get_top_posts(sentiment=sentiment, platform=platform, limit=limit,
+                                        projection=TOP_POST_PROJECTION)
 
-        return jsonify({
+        return json_response({
             'success': True,
-            'data': cleaned_posts,
+            'data': [clean_top_post(post) for post in posts],
             'timestamp': datetime.now().isoformat()
         })
     except Exception as e:
-        logging.error(f"Error getting top posts: {e}")
+        logger.error("Error getting top posts: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+@dataclass
+class PostMetrics:
+    __slots__ = ('likes', 'retweets', 'score')
+    likes: int
+    retweets: int
+    score: int
+
+@dataclass
+class RecentPost:
+    """Recent post as returned to the frontend; orjson serializes it natively"""
+    __slots__ = ('id', 'text', 'platform', 'created_at', 'author', 'metrics')
+    id: Any
+    text: str
+    platform: Optional[str]
+    created_at: Optional[datetime]
+    author: Any
+    metrics: PostMetrics
+
+def clean_recent_post(post: dict) -> RecentPost:
+    """Shape a raw post document for the frontend"""
+    get = post.get
+    return RecentPost(
+        get('_id'),
+        get('text', '') or get('title', ''),
+        get('platform'),
+        get('created_at'),
+        get('author_id') or get('author'),
+        PostMetrics(get('likes', 0), get('retweets', 0), get('score', 0))
+    )
+
 @app.route('/api/posts/recent')
 def get_recent_posts():
     """Get recent posts"""
@@ -113,54 +245,46 @@ def get_recent_posts():
     limit = int(request.args.get('limit', 50))
 
     try:
-        posts = db_client.get_recent_posts(platform=platform, hours=hours, limit=limit)
-
-        # Clean up posts for frontend
-        cleaned_posts = []
-        for post in posts:
-            cleaned_post = {
-                'id': str(post.get('_id')),
-                'text': post.get('text', '') or post.get('title', ''),
-                'platform': post.get('platform'),
-                'created_at': post.get('created_at').isoformat() if post.get('created_at') else None,
-                'author': post.get('author_id') or post.get('author'),
-                'metrics': {
-                    'likes': post.get('likes', 0),
-                    'retweets': post.get('retweets', 0),
-                    'score': post.get('score', 0)
-                }
-            }
-            cleaned_posts.append(cleaned_post)
+        posts = get_db().yield_recent_posts(platform=platform, hours=hours, limit=limit,
+                                             projection=RECENT_POST_PROJECTION)
+        # Run the query and read the first document now, so database errors reach the 500 path below
+        first_post = next(posts, None)
+        if first_post is not None:
+            posts = chain((first_post,), posts)
 
-        return jsonify({
-            'success': True,
-            'data': cleaned_posts,
-            'count': len(cleaned_posts),
-            'timestamp': datetime.now().isoformat()
-        })
+        def generate():
+            # Emit the JSON envelope piecewise so only one post is held in memory at a time
+            count = 0
+            yield b'{"success":true,"data":['
+            for post in posts:
+                yield (b',' if count else b'') + orjson.dumps(clean_recent_post(post), default=str)
+                count += 1
+            yield b'],"count":%d,"timestamp":%s}' % (count, orjson.dumps(datetime.now().isoformat()))
+
+        return app.response_class(stream_with_context(generate()), mimetype='application/json')
     except Exception as e:
-        logging.error(f"Error getting recent posts: {e}")
+        logger.error("Error getting recent posts: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 @app.route('/api/stats/overview')
+@ttl_cache()
 def get_overview_stats():
     """Get overview statistics"""
+    _start_overview_refresh()
+
     try:
-        # Get stats for last 24 hours
-        twitter_summary = db_client.get_sentiment_summary(platform='twitter', hours=24)
-        reddit_summary = db_client.get_sentiment_summary(platform='reddit', hours=24)
-        youtube_summary = db_client.get_sentiment_summary(platform='youtube', hours=24)
-        overall_summary = db_client.get_sentiment_summary(hours=24)
+        # Get stats for last 24 hours in one aggregation over all platforms
+        summaries = get_db().get_all_platform_summaries(hours=24)
 
         stats = {
-            'overall': overall_summary,
+            'overall': summaries['overall'],
             'platforms': {
-                'twitter': twitter_summary,
-                'reddit': reddit_summary,
-                'youtube': youtube_summary
+                'twitter': summaries['twitter'],
+                'reddit': summaries['reddit'],
+                'youtube': summaries['youtube']
             },
             'last_updated': datetime.now().isoformat()
         }
@@ -170,12 +294,42 @@ def get_overview_stats():
             'data': stats
         })
     except Exception as e:
-        logging.error(f"Error getting overview stats: {e}")
+        logger.error("Error getting overview stats: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+_overview_refresh_started = False
+_overview_refresh_lock = threading.Lock()
+
+def _refresh_overview_cache():
+    """Recompute overview stats in the background so dashboard polls hit a warm cache"""
+    try:
+        with app.test_request_context('/api/stats/overview'):
+            response = get_overview_stats.__wrapped__()
+            if not isinstance(response, tuple):
+                with get_overview_stats.cache_lock:
+                    get_overview_stats.cache[request.full_path] = response.get_data()
+    except Exception as e:
+        logger.error("Error refreshing overview stats: %s", e)
+    finally:
+        _schedule_overview_refresh()
+
+def _schedule_overview_refresh():
+    """Refresh the overview cache at half the TTL so entries never go cold"""
+    timer = threading.Timer(Config.UPDATE_INTERVAL / 2, _refresh_overview_cache)
+    timer.daemon = True
+    timer.start()
+
+def _start_overview_refresh():
+    """Start the overview refresh timer once, on the first request"""
+    global _overview_refresh_started
+    with _overview_refresh_lock:
+        if not _overview_refresh_started:
+            _overview_refresh_started = True
+            _schedule_overview_refresh()
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({
@@ -1,9 +1,15 @@
 import praw
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import List, Dict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config.settings import Config
 
+logger = logging.getLogger(__name__)
+
 class RedditCollector:
     def __init__(self):
         self.reddit = praw.Reddit(
@@ -12,44 +18,84 @@ class RedditCollector:
             user_agent=Config.REDDIT_USER_AGENT
         )
 
+        # Let concurrent subreddit searches share keep-alive connections from one larger pool
+        self.reddit._core._requestor._http.mount('https://', HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.5)
+        ))
+        self._subreddits = {}
+
+    def _get_subreddit(self, subreddit_name: str):
+        """Return a cached Subreddit handle"""
+        subreddit = self._subreddits.get(subreddit_name)
+        if subreddit is None:
+            subreddit = self._subreddits[subreddit_name] = self.reddit.subreddit(subreddit_name)
+        return subreddit
+
     def collect_posts(self, subreddits: List[str], keywords: List[str], limit: int = 100) -> List[Dict]:
         """Collect Reddit posts from specified subreddits"""
         posts_data = []
+        if not subreddits or not keywords:
+            return posts_data
+
+        # One boolean search per subreddit instead of one request per keyword
+        query = " OR ".join(f'"{keyword}"' for keyword in keywords)
+        collected_at = datetime.now()
+
+        try:
+            with ThreadPoolExecutor(max_workers=min(8, len(subreddits))) as executor:
+                futures = [
+                    executor.submit(self._search_subreddit, subreddit_name, query, keywords, limit, collected_at)
+                    for subreddit_name in subreddits
+                ]
+                for future in as_completed(futures):
+                    posts_data.extend(future.result())
+
+        except Exception as e:
+            logger.error("Error collecting Reddit posts: %s", e)
+
+        return posts_data
+
+    async def collect_posts_async(self, subreddits: List[str], keywords: List[str], limit: int = 100) -> List[Dict]:
+        """Collect Reddit posts without blocking the event loop"""
+        return await asyncio.to_thread(self.collect_posts, subreddits, keywords, limit)
+
+    def _search_subreddit(self, subreddit_name: str, query: str, keywords: List[str], limit: int,
+                          collected_at: datetime) -> List[Dict]:
+        """Run a single keyword search against one subreddit"""
+        posts_data = []
 
         try:
-            for subreddit_name in subreddits:
-                subreddit = self.reddit.subreddit(subreddit_name)
-
-                # Search for posts with keywords
-                for keyword in keywords:
-                    search_results = subreddit.search(keyword, limit=limit//len(keywords))
-
-                    for submission in search_results:
-                        post_data = {
-                            'id': submission.id,
-                            'title': submission.title,
-                            'text': submission.selftext,
-                            'created_at': datetime.fromtimestamp(submission.created_utc),
-                            'author': str(submission.author) if submission.author else '[deleted]',
-                            'platform': 'reddit',
-                            'subreddit': subreddit_name,
-                            'upvotes': submission.ups,
-                            'downvotes': submission.downs,
-                            'score': submission.score,
-                            'num_comments': submission.num_comments,
-                            'collected_at': datetime.now(),
-                            'keywords': keywords
-                        }
-                        posts_data.append(post_data)
+            subreddit = self._get_subreddit(subreddit_name)
+
+            for submission in subreddit.search(query, limit=limit, sort='new'):
+                post_data = {
+                    'id': submission.id,
+                    'title': submission.title,
+                    'text': submission.selftext,
+                    'created_at': datetime.fromtimestamp(submission.created_utc),
+                    'author': str(submission.author) if submission.author else '[deleted]',
+                    'platform': 'reddit',
+                    'subreddit': subreddit_name,
+                    'upvotes': submission.ups,
+                    'downvotes': submission.downs,
+                    'score': submission.score,
+                    'num_comments': submission.num_comments,
+                    'collected_at': collected_at,
+                    'keywords': keywords
+                }
+                posts_data.append(post_data)
 
         except Exception as e:
-            logging.error(f"Error collecting Reddit posts: {e}")
+            logger.error("Error collecting Reddit posts from r/%s: %s", subreddit_name, e)
 
         return posts_data
 
     def collect_comments(self, submission_id: str, limit: int = 50) -> List[Dict]:
         """Collect comments from a specific Reddit post"""
         comments_data = []
+        collected_at = datetime.now()
 
         try:
             submission = self.reddit.submission(id=submission_id)
@@ -64,11 +110,11 @@ class RedditCollector:
                     'platform': 'reddit',
                     'parent_id': submission_id,
                     'score': comment.score,
-                    'collected_at': datetime.now()
+                    'collected_at': collected_at
                 }
                 comments_data.append(comment_data)
 
         except Exception as e:
-            logging.error(f"Error collecting Reddit comments: {e}")
+            logger.error("Error collecting Reddit comments: %s", e)
 
         return comments_data
\ No newline at end of file
@@ -1,10 +1,14 @@
 import tweepy
+import asyncio
 import logging
+import random
 import time
 from datetime import datetime
 from typing import List, Dict, Optional
 from config.settings import Config
 
+logger = logging.getLogger(__name__)
+
 class TwitterCollector:
     def __init__(self):
         self.client = tweepy.Client(bearer_token=Config.TWITTER_BEARER_TOKEN)
@@ -18,55 +22,66 @@ class TwitterCollector:
     def collect_tweets(self, keywords: List[str], max_results: int = 100) -> List[Dict]:
         """Collect tweets for given keywords with rate limiting protection"""
         tweets_data = []
+        collected_at = datetime.now()
         max_retries = 3
         backoff_time = 60  # Start with 1 minute backoff
 
+        # Request parameters do not change between retries; lang:en filters to English server-side
+        query = f'({" OR ".join(keywords)}) lang:en'
+        max_results_per_request = min(max_results, 10)  # Limit to 10 per request to avoid rate limits
+        tweet_fields = ['created_at', 'author_id', 'public_metrics']
+
         for attempt in range(max_retries):
             try:
-                query = " OR ".join(keywords)
                 tweets = tweepy.Paginator(
                     self.client.search_recent_tweets,
                     query=query,
-                    max_results=min(max_results, 10),  # Limit to 10 per request to avoid rate limits
-                    tweet_fields=['created_at', 'author_id', 'public_metrics', 'lang']
+                    max_results=max_results_per_request,
+                    tweet_fields=tweet_fields
                 ).flatten(limit=max_results)
 
                 for tweet in tweets:
-                    if tweet.lang == 'en':  # Only English tweets
-                        tweet_data = {
-                            'id': tweet.id,
-                            'text': tweet.text,
-                            'created_at': tweet.created_at,
-                            'author_id': tweet.author_id,
-                            'platform': 'twitter',
-                            'likes': tweet.public_metrics.get('like_count', 0),
-                            'retweets': tweet.public_metrics.get('retweet_count', 0),
-                            'collected_at': datetime.now(),
-                            'keywords': keywords
-                        }
-                        tweets_data.append(tweet_data)
+                    tweet_data = {
+                        'id': tweet.id,
+                        'text': tweet.text,
+                        'created_at': tweet.created_at,
+                        'author_id': tweet.author_id,
+                        'platform': 'twitter',
+                        'likes': tweet.public_metrics.get('like_count', 0),
+                        'retweets': tweet.public_metrics.get('retweet_count', 0),
+                        'collected_at': collected_at,
+                        'keywords': keywords
+                    }
+                    tweets_data.append(tweet_data)
 
                 # If successful, break out of retry loop
                 break
 
             except tweepy.TooManyRequests as e:
                 if attempt < max_retries - 1:
-                    logging.warning(f"Rate limited. Waiting {backoff_time} seconds before retry {attempt + 1}/{max_retries}")
-                    time.sleep(backoff_time)
+                    # Jitter keeps multiple collectors from retrying in lockstep
+                    wait_time = backoff_time + random.uniform(0, 5)
+                    logger.warning("Rate limited. Waiting %.1f seconds before retry %s/%s", wait_time, attempt + 1, max_retries)
+                    time.sleep(wait_time)
                     backoff_time *= 2  # Exponential backoff
                 else:
-                    logging.error(f"Rate limit exceeded after {max_retries} attempts: {e}")
+                    logger.error("Rate limit exceeded after %s attempts: %s", max_retries, e)
                     return []
             except Exception as e:
-                logging.error(f"Error collecting tweets: {e}")
+                logger.error("Error collecting tweets: %s", e)
                 if attempt < max_retries - 1:
-                    logging.info(f"Retrying in {min(backoff_time, 30)} seconds... (attempt {attempt + 1}/{max_retries})")
-                    time.sleep(min(backoff_time, 30))
+                    wait_time = min(backoff_time, 30) + random.uniform(0, 5)
+                    logger.info("Retrying in %.1f seconds... (attempt %s/%s)", wait_time, attempt + 1, max_retries)
+                    time.sleep(wait_time)
                 else:
                     return []
 
         return tweets_data
 
+    async def collect_tweets_async(self, keywords: List[str], max_results: int = 100) -> List[Dict]:
+        """Collect tweets without blocking the event loop"""
+        return await asyncio.to_thread(self.collect_tweets, keywords, max_results)
+
     def stream_tweets(self, keywords: List[str]):
         """Stream real-time tweets (for future implementation)"""
         pass
\ No newline at end of file
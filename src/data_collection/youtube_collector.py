@@ -1,9 +1,29 @@
 from googleapiclient.discovery import build
+import asyncio
 import logging
+import sys
 from datetime import datetime
 from typing import List, Dict
 from config.settings import Config
 
+try:
+    # C parser, accepts the trailing 'Z' YouTube uses
+    from ciso8601 import parse_datetime
+except ImportError:
+    if sys.version_info >= (3, 11):
+        parse_datetime = datetime.fromisoformat
+    else:
+        def parse_datetime(value: str) -> datetime:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+logger = logging.getLogger(__name__)
+
+# Partial-response field masks: only request the paths we actually read
+SEARCH_FIELDS = 'items(id/videoId,snippet(title,description,channelTitle,publishedAt))'
+COMMENT_FIELDS = 'items(snippet/topLevelComment(id,snippet(textDisplay,authorDisplayName,publishedAt,likeCount)))'
+VIDEO_STATS_FIELDS = 'items(id,statistics(viewCount,likeCount,commentCount))'
+MAX_IDS_PER_REQUEST = 50
+
 class YouTubeCollector:
     def __init__(self):
         self.youtube = build('youtube', 'v3', developerKey=Config.YOUTUBE_API_KEY)
@@ -11,6 +31,7 @@ class YouTubeCollector:
     def search_videos(self, keywords: List[str], max_results: int = 50) -> List[Dict]:
         """Search for YouTube videos based on keywords"""
         videos_data = []
+        collected_at = datetime.now()
 
         try:
             query = " OR ".join(keywords)
@@ -19,7 +40,8 @@ class YouTubeCollector:
                 part='id,snippet',
                 maxResults=max_results,
                 type='video',
-                order='relevance'
+                order='relevance',
+                fields=SEARCH_FIELDS
             ).execute()
 
             for item in search_response['items']:
@@ -28,66 +50,112 @@ class YouTubeCollector:
                     'title': item['snippet']['title'],
                     'description': item['snippet']['description'],
                     'channel': item['snippet']['channelTitle'],
-                    'published_at': datetime.fromisoformat(item['snippet']['publishedAt'].replace('Z', '+00:00')),
+                    'published_at': parse_datetime(item['snippet']['publishedAt']),
                     'platform': 'youtube',
-                    'collected_at': datetime.now(),
+                    'collected_at': collected_at,
                     'keywords': keywords
                 }
                 videos_data.append(video_data)
 
         except Exception as e:
-            logging.error(f"Error searching YouTube videos: {e}")
+            logger.error("Error searching YouTube videos: %s", e)
 
         return videos_data
 
+    async def search_videos_async(self, keywords: List[str], max_results: int = 50) -> List[Dict]:
+        """Search YouTube videos without blocking the event loop"""
+        return await asyncio.to_thread(self.search_videos, keywords, max_results)
+
     def collect_comments(self, video_id: str, max_results: int = 100) -> List[Dict]:
         """Collect comments from a YouTube video"""
         comments_data = []
+        collected_at = datetime.now()
 
         try:
-            comments_response = self.youtube.commentThreads().list(
-                part='snippet',
-                videoId=video_id,
-                maxResults=max_results,
-                order='relevance'
-            ).execute()
+            comments_response = self._comment_threads_request(video_id, max_results).execute()
 
             for item in comments_response['items']:
-                comment = item['snippet']['topLevelComment']['snippet']
-                comment_data = {
-                    'id': item['snippet']['topLevelComment']['id'],
-                    'text': comment['textDisplay'],
-                    'author': comment['authorDisplayName'],
-                    'created_at': datetime.fromisoformat(comment['publishedAt'].replace('Z', '+00:00')),
-                    'likes': comment['likeCount'],
-                    'platform': 'youtube',
-                    'video_id': video_id,
-                    'collected_at': datetime.now()
-                }
-                comments_data.append(comment_data)
+                comments_data.append(self._parse_comment(item, video_id, collected_at))
 
         except Exception as e:
-            logging.error(f"Error collecting YouTube comments: {e}")
+            logger.error("Error collecting YouTube comments: %s", e)
 
         return comments_data
 
+    def collect_comments_batch(self, video_ids: List[str], max_results: int = 100) -> Dict[str, List[Dict]]:
+        """Collect comments for many videos in a single batched HTTP request"""
+        comments_by_video = {video_id: [] for video_id in video_ids}
+        collected_at = datetime.now()
+
+        def handle_response(request_id, response, exception):
+            if exception is not None:
+                logger.error("Error collecting YouTube comments for %s: %s", request_id, exception)
+                return
+            for item in response.get('items', []):
+                comments_by_video[request_id].append(self._parse_comment(item, request_id, collected_at))
+
+        try:
+            # The batch endpoint accepts at most 50 calls per request
+            for start in range(0, len(video_ids), MAX_IDS_PER_REQUEST):
+                batch = self.youtube.new_batch_http_request(callback=handle_response)
+                for video_id in video_ids[start:start + MAX_IDS_PER_REQUEST]:
+                    batch.add(self._comment_threads_request(video_id, max_results), request_id=video_id)
+                batch.execute()
+
+        except Exception as e:
+            logger.error("Error collecting YouTube comments batch: %s", e)
+
+        return comments_by_video
+
+    def _comment_threads_request(self, video_id: str, max_results: int):
+        """Build a commentThreads.list request for one video"""
+        return self.youtube.commentThreads().list(
+            part='snippet',
+            videoId=video_id,
+            maxResults=max_results,
+            order='relevance',
+            fields=COMMENT_FIELDS
+        )
+
+    def _parse_comment(self, item: Dict, video_id: str, collected_at: datetime) -> Dict:
+        """Convert a commentThread resource into a comment record"""
+        comment = item['snippet']['topLevelComment']['snippet']
+        return {
+            'id': item['snippet']['topLevelComment']['id'],
+            'text': comment['textDisplay'],
+            'author': comment['authorDisplayName'],
+            'created_at': parse_datetime(comment['publishedAt']),
+            'likes': comment['likeCount'],
+            'platform': 'youtube',
+            'video_id': video_id,
+            'collected_at': collected_at
+        }
+
     def get_video_stats(self, video_id: str) -> Dict:
         """Get video statistics"""
+        return self.get_video_stats_batch([video_id]).get(video_id, {})
+
+    def get_video_stats_batch(self, video_ids: List[str]) -> Dict[str, Dict]:
+        """Get statistics for many videos, up to 50 ids per request"""
+        stats_by_video = {}
+
         try:
-            stats_response = self.youtube.videos().list(
-                part='statistics',
-                id=video_id
-            ).execute()
+            for start in range(0, len(video_ids), MAX_IDS_PER_REQUEST):
+                stats_response = self.youtube.videos().list(
+                    part='statistics',
+                    id=','.join(video_ids[start:start + MAX_IDS_PER_REQUEST]),
+                    fields=VIDEO_STATS_FIELDS
+                ).execute()
 
-            if stats_response['items']:
-                stats = stats_response['items'][0]['statistics']
-                return {
-                    'views': int(stats.get('viewCount', 0)),
-                    'likes': int(stats.get('likeCount', 0)),
-                    'comments': int(stats.get('commentCount', 0))
-                }
+                for item in stats_response['items']:
+                    stats = item['statistics']
+                    stats_by_video[item['id']] = {
+                        'views': int(stats.get('viewCount', 0)),
+                        'likes': int(stats.get('likeCount', 0)),
+                        'comments': int(stats.get('commentCount', 0))
+                    }
 
         except Exception as e:
-            logging.error(f"Error getting video stats: {e}")
+            logger.error("Error getting video stats: %s", e)
 
-        return {}
\ No newline at end of file
+        return stats_by_video
@@ -1,28 +1,56 @@
-from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo import MongoClient, InsertOne, ReplaceOne, ASCENDING, DESCENDING
 from pymongo.collection import Collection
 from pymongo.database import Database
 import logging
+import threading
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional
 from config.settings import Config
 
+logger = logging.getLogger(__name__)
+
 class MongoDBClient:
-    def __init__(self):
+    # Aggregation results shared by every client in the process, so pipeline writes
+    # invalidate what the dashboard reads; entries also expire after 30 seconds
+    _summary_cache = TTLCache(maxsize=64, ttl=30)
+    _trend_cache = TTLCache(maxsize=64, ttl=30)
+    _cache_lock = threading.Lock()
+
+    def __init__(self, connect: bool = True):
         self.client = None
         self.db = None
-        self.connect()
+        self.connect(verify=connect)
 
-    def connect(self):
-        """Connect to MongoDB"""
+    def connect(self, verify: bool = True):
+        """Connect to MongoDB; with verify=False no network I/O happens until the first query"""
         try:
-            self.client = MongoClient(Config.MONGODB_URI)
+            # The pipeline has at most a few concurrent writers and each gunicorn worker
+            # runs 8 threads, so a small pool avoids idle server connections (~1MB each).
+            # zstd shrinks text-heavy post payloads on the wire; zlib is the stdlib fallback.
+            # connect=False defers socket setup so each forked worker builds its own pool.
+            self.client = MongoClient(
+                Config.MONGODB_URI,
+                maxPoolSize=10,
+                minPoolSize=2,
+                maxIdleTimeMS=60000,
+                compressors='zstd,zlib',
+                serverSelectionTimeoutMS=5000,
+                socketTimeoutMS=20000,
+                retryWrites=True,
+                w=1,
+                connect=False
+            )
             self.db = self.client[Config.DATABASE_NAME]
-            # Test connection
-            self.client.admin.command('ping')
-            logging.info("Connected to MongoDB successfully")
-            self.setup_indexes()
+
+            if verify:
+                # Test connection
+                self.client.admin.command('ping')
+                logger.info("Connected to MongoDB successfully")
+                self.setup_indexes()
         except Exception as e:
-            logging.error(f"Failed to connect to MongoDB: {e}")
+            logger.error("Failed to connect to MongoDB: %s", e)
             raise
 
     def setup_indexes(self):
@@ -36,21 +64,31 @@ class MongoDBClient:
             # Sentiment results collection indexes
             self.db.sentiment_results.create_index([("platform", ASCENDING), ("created_at", DESCENDING)])
             self.db.sentiment_results.create_index([("sentiment.label", ASCENDING)])
-            self.db.sentiment_results.create_index([("processed_at", DESCENDING)])
+            self.db.sentiment_results.create_index([("processed_at", DESCENDING), ("sentiment.label", ASCENDING)])
+
+            # One document per post, so re-collected posts upsert instead of duplicating;
+            # created last since it fails if older data already holds duplicates
+            self.db.raw_posts.create_index([("platform", ASCENDING), ("id", ASCENDING)], unique=True)
 
-            logging.info("Database indexes created successfully")
+            logger.info("Database indexes created successfully")
         except Exception as e:
-            logging.error(f"Error creating indexes: {e}")
+            logger.error("Error creating indexes: %s", e)
+
+    @staticmethod
+    def _raw_post_upsert(post: Dict) -> ReplaceOne:
+        """Idempotent write of one raw post keyed on (platform, id)"""
+        return ReplaceOne({'platform': post.get('platform'), 'id': post.get('id')}, post, upsert=True)
 
     def insert_raw_posts(self, posts: List[Dict]) -> List:
-        """Insert raw social media posts"""
+        """Insert raw social media posts, replacing ones already stored"""
         try:
             if posts:
-                result = self.db.raw_posts.insert_many(posts)
-                logging.info(f"Inserted {len(result.inserted_ids)} raw posts")
-                return result.inserted_ids
+                # Unordered so the server can apply the batch in parallel and skip past bad documents
+                result = self.db.raw_posts.bulk_write([self._raw_post_upsert(post) for post in posts], ordered=False)
+                logger.info("Inserted %s new raw posts, updated %s", result.upserted_count, result.modified_count)
+                return list(result.upserted_ids.values())
         except Exception as e:
-            logging.error(f"Error inserting raw posts: {e}")
+            logger.error("Error inserting raw posts: %s", e)
         return []
 
     def insert_sentiment_results(self, results: List[Dict]) -> List:
@@ -58,38 +96,89 @@ class MongoDBClient:
         try:
             if results:
                 # Add processing timestamp
-                for result in results:
-                    result['processed_at'] = datetime.now()
+                now = datetime.now()
+                results = [{**result, 'processed_at': now} for result in results]
 
-                result = self.db.sentiment_results.insert_many(results)
-                logging.info(f"Inserted {len(result.inserted_ids)} sentiment results")
+                result = self.db.sentiment_results.insert_many(results, ordered=False)
+                self.invalidate_cache()
+                logger.info("Inserted %s sentiment results", len(result.inserted_ids))
                 return result.inserted_ids
         except Exception as e:
-            logging.error(f"Error inserting sentiment results: {e}")
+            logger.error("Error inserting sentiment results: %s", e)
         return []
 
-    def get_recent_posts(self, platform: Optional[str] = None, hours: int = 24, limit: int = 1000) -> List[Dict]:
+    def store_cycle_batch(self, raw_posts: List[Dict], sentiment_results: List[Dict]) -> Dict[str, int]:
+        """Write a pipeline cycle's raw posts (upserted) and sentiment results as two concurrent unordered bulk writes"""
+        now = datetime.now()
+        operations = {
+            'raw_posts': [self._raw_post_upsert(post) for post in raw_posts],
+            'sentiment_results': [InsertOne({**result, 'processed_at': now}) for result in sentiment_results]
+        }
+        inserted = {'raw_posts': 0, 'sentiment_results': 0}
+
+        def write(collection_name: str) -> int:
+            try:
+                result = self.db[collection_name].bulk_write(operations[collection_name], ordered=False)
+                return result.inserted_count + result.upserted_count
+            except Exception as e:
+                logger.error("Error writing %s: %s", collection_name, e)
+                return 0
+
+        pending = [name for name, ops in operations.items() if ops]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for name, count in zip(pending, executor.map(write, pending)):
+                inserted[name] = count
+
+        if inserted['sentiment_results']:
+            self.invalidate_cache()
+
+        logger.info("Inserted %s raw posts and %s sentiment results", inserted['raw_posts'], inserted['sentiment_results'])
+        return inserted
+
+    def invalidate_cache(self):
+        """Drop cached summaries and trends after new sentiment results are written"""
+        with self._cache_lock:
+            self._summary_cache.clear()
+            self._trend_cache.clear()
+
+    def get_recent_posts(self, platform: Optional[str] = None, hours: int = 24, limit: int = 1000,
+                         projection: Optional[Dict] = None) -> List[Dict]:
         """Get recent posts from the database"""
         try:
-            query = {}
-            if platform:
-                query['platform'] = platform
+            return list(self.yield_recent_posts(platform=platform, hours=hours, limit=limit, projection=projection))
+        except Exception as e:
+            logger.error("Error getting recent posts: %s", e)
+            return []
 
-            # Get posts from last N hours
-            since = datetime.now() - timedelta(hours=hours)
-            query['created_at'] = {'$gte': since}
+    def yield_recent_posts(self, platform: Optional[str] = None, hours: int = 24, limit: int = 1000,
+                           projection: Optional[Dict] = None) -> Iterator[Dict]:
+        """Stream recent posts from the database one document at a time
 
-            posts = list(self.db.raw_posts.find(query)
-                        .sort('created_at', DESCENDING)
-                        .limit(limit))
+        Database errors are raised to the caller while iterating rather than swallowed.
+        """
+        query = {}
+        if platform:
+            query['platform'] = platform
 
-            return posts
-        except Exception as e:
-            logging.error(f"Error getting recent posts: {e}")
-            return []
+        # Get posts from last N hours
+        since = datetime.now() - timedelta(hours=hours)
+        query['created_at'] = {'$gte': since}
+
+        cursor = (self.db.raw_posts.find(query, projection)
+                  .sort('created_at', DESCENDING)
+                  .limit(limit)
+                  .batch_size(200))
+
+        yield from cursor
 
     def get_sentiment_summary(self, platform: Optional[str] = None, hours: int = 24) -> Dict:
         """Get sentiment summary statistics"""
+        key = ('summary', platform, hours)
+        with self._cache_lock:
+            cached = self._summary_cache.get(key)
+        if cached is not None:
+            return cached
+
         try:
             match_stage = {}
             if platform:
@@ -108,24 +197,84 @@ class MongoDBClient:
             ]
 
             results = list(self.db.sentiment_results.aggregate(pipeline))
+            summary = self._counts_to_summary(results)
 
-            # Convert to percentage
-            total = sum(item['count'] for item in results)
-            summary = {'positive': 0, 'neutral': 0, 'negative': 0, 'total': total}
-
-            for item in results:
-                label = item['_id']
-                percentage = (item['count'] / total * 100) if total > 0 else 0
-                summary[label] = round(percentage, 2)
-
+            with self._cache_lock:
+                self._summary_cache[key] = summary
             return summary
 
         except Exception as e:
-            logging.error(f"Error getting sentiment summary: {e}")
+            logger.error("Error getting sentiment summary: %s", e)
             return {'positive': 0, 'neutral': 0, 'negative': 0, 'total': 0}
 
+    def get_all_platform_summaries(self, hours: int = 24, platforms: tuple = ('twitter', 'reddit', 'youtube')) -> Dict:
+        """Get the overall and per-platform sentiment summaries in a single $facet aggregation"""
+        empty = {'positive': 0, 'neutral': 0, 'negative': 0, 'total': 0}
+
+        # Not cached here: the overview endpoint caches the rendered response itself
+        try:
+            since = datetime.now() - timedelta(hours=hours)
+            group_stage = {'$group': {'_id': '$sentiment.label', 'count': {'$sum': 1}}}
+
+            facets = {'overall': [group_stage]}
+            for platform in platforms:
+                facets[platform] = [{'$match': {'platform': platform}}, group_stage]
+
+            pipeline = [
+                {'$match': {'processed_at': {'$gte': since}}},
+                {'$facet': facets}
+            ]
+
+            results = next(self.db.sentiment_results.aggregate(pipeline), {})
+            return {name: self._counts_to_summary(results.get(name, [])) for name in facets}
+
+        except Exception as e:
+            logger.error("Error getting platform summaries: %s", e)
+            return {name: dict(empty) for name in ('overall',) + tuple(platforms)}
+
+    def _counts_to_summary(self, results: List[Dict]) -> Dict:
+        """Convert per-label counts into percentages"""
+        total = sum(item['count'] for item in results)
+        summary = {'positive': 0, 'neutral': 0, 'negative': 0, 'total': total}
+
+        for item in results:
+            label = item['_id']
+            percentage = (item['count'] / total * 100) if total > 0 else 0
+            summary[label] = round(percentage, 2)
+
+        return summary
+
+    @staticmethod
+    def _trend_stages() -> List[Dict]:
+        """Aggregation stages counting sentiment labels per hour"""
+        # Group on an hour-truncated date and only format the (few) group keys afterwards
+        return [
+            {'$group': {
+                '_id': {
+                    'bucket': {'$dateTrunc': {'date': '$processed_at', 'unit': 'hour'}},
+                    'sentiment': '$sentiment.label'
+                },
+                'count': {'$sum': 1}
+            }},
+            {'$sort': {'_id.bucket': 1}},
+            {'$project': {
+                '_id': {
+                    'date': {'$dateToString': {'format': '%Y-%m-%d', 'date': '$_id.bucket'}},
+                    'hour': {'$hour': '$_id.bucket'},
+                    'sentiment': '$_id.sentiment'
+                },
+                'count': 1
+            }}
+        ]
+
     def get_trend_data(self, platform: Optional[str] = None, days: int = 7) -> List[Dict]:
         """Get sentiment trend data over time"""
+        key = (platform, days)
+        with self._cache_lock:
+            cached = self._trend_cache.get(key)
+        if cached is not None:
+            return cached
+
         try:
             match_stage = {}
             if platform:
@@ -135,43 +284,101 @@ class MongoDBClient:
             since = datetime.now() - timedelta(days=days)
             match_stage['processed_at'] = {'$gte': since}
 
-            pipeline = [
-                {'$match': match_stage},
-                {'$group': {
-                    '_id': {
-                        'date': {'$dateToString': {'format': '%Y-%m-%d', 'date': '$processed_at'}},
-                        'hour': {'$hour': '$processed_at'},
-                        'sentiment': '$sentiment.label'
-                    },
-                    'count': {'$sum': 1}
-                }},
-                {'$sort': {'_id.date': 1, '_id.hour': 1}}
-            ]
+            pipeline = [{'$match': match_stage}] + self._trend_stages()
 
-            results = list(self.db.sentiment_results.aggregate(pipeline))
+            results = list(self.db.sentiment_results.aggregate(pipeline, allowDiskUse=False))
+
+            with self._cache_lock:
+                self._trend_cache[key] = results
             return results
 
         except Exception as e:
-            logging.error(f"Error getting trend data: {e}")
+            logger.error("Error getting trend data: %s", e)
             return []
 
-    def get_top_posts(self, sentiment: str, platform: Optional[str] = None, limit: int = 10) -> List[Dict]:
+    def get_top_posts(self, sentiment: str, platform: Optional[str] = None, limit: int = 10,
+                      projection: Optional[Dict] = None) -> List[Dict]:
         """Get top posts by sentiment"""
         try:
             query = {'sentiment.label': sentiment}
             if platform:
                 query['platform'] = platform
 
-            posts = list(self.db.sentiment_results.find(query)
+            posts = list(self.db.sentiment_results.find(query, projection)
                         .sort([('sentiment.confidence', DESCENDING), ('processed_at', DESCENDING)])
                         .limit(limit))
 
             return posts
 
         except Exception as e:
-            logging.error(f"Error getting top posts: {e}")
+            logger.error("Error getting top posts: %s", e)
             return []
 
+    def dashboard_snapshot(self, platform: Optional[str] = None, hours: int = 24, days: int = 7,
+                           top_n: int = 10, projection: Optional[Dict] = None) -> Dict:
+        """Get the summary, trends and top positive/negative posts in a single $facet aggregation
+
+        The summary covers the last `hours`; trends and top posts cover the last `days`.
+        """
+        empty = {
+            'summary': {'positive': 0, 'neutral': 0, 'negative': 0, 'total': 0},
+            'trend': [], 'top_positive': [], 'top_negative': []
+        }
+
+        key = ('snapshot', platform, hours, days, top_n, repr(projection))
+        with self._cache_lock:
+            cached = self._summary_cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            now = datetime.now()
+            summary_since = now - timedelta(hours=hours)
+            trend_since = now - timedelta(days=days)
+
+            match_stage = {'processed_at': {'$gte': min(summary_since, trend_since)}}
+            if platform:
+                match_stage['platform'] = platform
+
+            def top_posts(label: str) -> List[Dict]:
+                stages = [
+                    {'$match': {'sentiment.label': label, 'processed_at': {'$gte': trend_since}}},
+                    {'$sort': {'sentiment.confidence': -1, 'processed_at': -1}},
+                    {'$limit': top_n}
+                ]
+                if projection:
+                    stages.append({'$project': projection})
+                return stages
+
+            pipeline = [
+                {'$match': match_stage},
+                {'$facet': {
+                    'summary': [
+                        {'$match': {'processed_at': {'$gte': summary_since}}},
+                        {'$group': {'_id': '$sentiment.label', 'count': {'$sum': 1}}}
+                    ],
+                    'trend': [{'$match': {'processed_at': {'$gte': trend_since}}}] + self._trend_stages(),
+                    'top_positive': top_posts('positive'),
+                    'top_negative': top_posts('negative')
+                }}
+            ]
+
+            results = next(self.db.sentiment_results.aggregate(pipeline), {})
+            snapshot = {
+                'summary': self._counts_to_summary(results.get('summary', [])),
+                'trend': results.get('trend', []),
+                'top_positive': results.get('top_positive', []),
+                'top_negative': results.get('top_negative', [])
+            }
+
+            with self._cache_lock:
+                self._summary_cache[key] = snapshot
+            return snapshot
+
+        except Exception as e:
+            logger.error("Error getting dashboard snapshot: %s", e)
+            return empty
+
     def cleanup_old_data(self, days: int = 30):
         """Remove old data to save storage space"""
         try:
@@ -179,17 +386,17 @@ class MongoDBClient:
 
             # Remove old raw posts
             raw_result = self.db.raw_posts.delete_many({'collected_at': {'$lt': cutoff_date}})
-            logging.info(f"Deleted {raw_result.deleted_count} old raw posts")
+            logger.info("Deleted %s old raw posts", raw_result.deleted_count)
 
             # Remove old sentiment results
             sentiment_result = self.db.sentiment_results.delete_many({'processed_at': {'$lt': cutoff_date}})
-            logging.info(f"Deleted {sentiment_result.deleted_count} old sentiment results")
+            logger.info("Deleted %s old sentiment results", sentiment_result.deleted_count)
 
         except Exception as e:
-            logging.error(f"Error cleaning up old data: {e}")
+            logger.error("Error cleaning up old data: %s", e)
 
     def close_connection(self):
         """Close database connection"""
         if self.client:
             self.client.close()
-            logging.info("MongoDB connection closed")
\ No newline at end of file
+            logger.info("MongoDB connection closed")
\ No newline at end of file
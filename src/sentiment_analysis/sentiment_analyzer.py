@@ -1,30 +1,66 @@
-import tensorflow as tf
 import numpy as np
 import pickle
 import logging
 from typing import Dict, List, Tuple
-from textblob import TextBlob
+from scipy.special import softmax
+from nltk.sentiment.vader import SentimentIntensityAnalyzer
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+from config.settings import Config
 from .text_preprocessor import TextPreprocessor
 
+try:
+    import onnxruntime
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import StringTensorType
+except ImportError:  # optional inference backend
+    onnxruntime = None
+
+logger = logging.getLogger(__name__)
+
 class SentimentAnalyzer:
     def __init__(self):
-        self.preprocessor = TextPreprocessor()
+        self.preprocessor = TextPreprocessor()  # also fetches the vader_lexicon data
+        self._vader = None
+        self._vader_checked = False
         self.model = None
         self.vectorizer = None
         self.is_trained = False
 
-    def textblob_sentiment(self, text: str) -> Dict:
-        """Quick sentiment analysis using TextBlob"""
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity  # -1 to 1
-        subjectivity = blob.sentiment.subjectivity  # 0 to 1
+        # int8 copy of the model weights used for inference
+        self._coef_q = None
+        self._scale = None
+        self._intercept = None
+
+        # ONNX Runtime session for vectorizer + model, built when USE_ONNX_RUNTIME is set
+        self._onnx_session = None
+
+    @property
+    def vader(self):
+        """VADER analyzer, or None when the vader_lexicon data is unavailable"""
+        if not self._vader_checked:
+            self._vader_checked = True
+            try:
+                self._vader = SentimentIntensityAnalyzer()
+            except LookupError as e:
+                logger.warning("VADER lexicon unavailable, lexicon sentiment will be neutral: %s", e)
+        return self._vader
+
+    def lexicon_sentiment(self, text: str) -> Dict:
+        """Quick lexicon-based sentiment analysis (VADER), used when no trained model is available"""
+        if self.vader is None:
+            return {'label': 'neutral', 'polarity': 0.0, 'subjectivity': 0.0, 'confidence': 0.0}
 
-        if polarity > 0.1:
+        scores = self.vader.polarity_scores(text)
+        polarity = scores['compound']  # -1 to 1
+        subjectivity = 1 - scores['neu']  # 0 to 1, share of the text carrying sentiment
+
+        # Standard VADER cut-offs on the compound score
+        if polarity >= 0.05:
             label = 'positive'
-        elif polarity < -0.1:
+        elif polarity <= -0.05:
             label = 'negative'
         else:
             label = 'neutral'
@@ -36,6 +72,9 @@ class SentimentAnalyzer:
             'confidence': abs(polarity)
         }
 
+    # Kept for callers written before the switch from TextBlob to VADER
+    textblob_sentiment = lexicon_sentiment
+
     def prepare_training_data(self, texts: List[str], labels: List[str]) -> Tuple:
         """Prepare data for training"""
         processed_texts = [self.preprocessor.preprocess(text) for text in texts]
@@ -66,25 +105,26 @@ class SentimentAnalyzer:
 
             # Evaluate
             accuracy = self.model.score(X_test, y_test)
-            logging.info(f"Model trained with accuracy: {accuracy:.2f}")
+            logger.info("Model trained with accuracy: %.2f", accuracy)
 
+            self._quantize_model()
+            self._build_onnx_session()
             self.is_trained = True
 
         except Exception as e:
-            logging.error(f"Error training model: {e}")
+            logger.error("Error training model: %s", e)
 
     def predict_sentiment(self, text: str) -> Dict:
         """Predict sentiment for a single text"""
         if not self.is_trained:
-            # Fall back to TextBlob if no trained model
-            return self.textblob_sentiment(text)
+            # Fall back to the lexicon analyzer if no trained model
+            return self.lexicon_sentiment(text)
 
         try:
             processed_text = self.preprocessor.preprocess(text)
-            text_vector = self.vectorizer.transform([processed_text])
 
-            prediction = self.model.predict(text_vector)[0]
-            probabilities = self.model.predict_proba(text_vector)[0]
+            probabilities = self._predict_proba_texts([processed_text])[0]
+            prediction = int(probabilities.argmax())
 
             label_map = {0: 'negative', 1: 'neutral', 2: 'positive'}
             predicted_label = label_map[prediction]
@@ -100,16 +140,103 @@ class SentimentAnalyzer:
             }
 
         except Exception as e:
-            logging.error(f"Error predicting sentiment: {e}")
-            return self.textblob_sentiment(text)
+            logger.error("Error predicting sentiment: %s", e)
+            return self.lexicon_sentiment(text)
+
+    def predict_sentiment_batch(self, texts: List[str]) -> List[Dict]:
+        """Predict sentiment for many texts with one vectorizer and model call"""
+        if not texts:
+            return []
+
+        if not self.is_trained:
+            return [self.lexicon_sentiment(text) for text in texts]
+
+        try:
+            processed_texts = [self.preprocessor.preprocess(text) for text in texts]
+
+            probabilities = self._predict_proba_texts(processed_texts)
+            predictions = probabilities.argmax(axis=1)
+
+            label_map = {0: 'negative', 1: 'neutral', 2: 'positive'}
+
+            return [
+                {
+                    'label': label_map[int(prediction)],
+                    'confidence': float(probs[prediction]),
+                    'probabilities': {
+                        'negative': float(probs[0]),
+                        'neutral': float(probs[1]),
+                        'positive': float(probs[2])
+                    }
+                }
+                for prediction, probs in zip(predictions, probabilities)
+            ]
+
+        except Exception as e:
+            logger.error("Error predicting sentiment batch: %s", e)
+            return [self.lexicon_sentiment(text) for text in texts]
+
+    def _quantize_model(self):
+        """Quantize model weights to int8 with one scale factor per class and keep TF-IDF in float32"""
+        # Inference already runs in float32; matching the vectorizer halves its IDF and output size
+        self.vectorizer.dtype = np.float32
+        self.vectorizer.idf_ = self.vectorizer.idf_.astype(np.float32)
+
+        coef = self.model.coef_
+        scales = np.abs(coef).max(axis=1) / 127
+        scales[scales == 0] = 1.0
+
+        self._coef_q = np.round(coef / scales[:, None]).astype(np.int8)
+        self._scale = scales.astype(np.float32)
+        self._intercept = self.model.intercept_.astype(np.float32)
+
+    def _predict_proba(self, text_vectors) -> np.ndarray:
+        """Class probabilities from the int8 weights (multinomial softmax over logits)"""
+        logits = np.asarray(text_vectors @ self._coef_q.T, dtype=np.float32) * self._scale + self._intercept
+        return softmax(logits, axis=1)
+
+    def _build_onnx_session(self):
+        """Compile the vectorizer and model into one ONNX Runtime graph, if enabled and installed"""
+        self._onnx_session = None
+        if not Config.USE_ONNX_RUNTIME:
+            return
+        if onnxruntime is None:
+            logger.warning("USE_ONNX_RUNTIME is set but onnxruntime/skl2onnx are not installed")
+            return
+
+        try:
+            onnx_model = convert_sklearn(
+                make_pipeline(self.vectorizer, self.model),
+                initial_types=[('input', StringTensorType([None, 1]))],
+                # Preprocessed text is space-separated words; return probabilities as one tensor
+                options={TfidfVectorizer: {'separators': [' ']}, LogisticRegression: {'zipmap': False}}
+            )
+
+            options = onnxruntime.SessionOptions()
+            options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+            self._onnx_session = onnxruntime.InferenceSession(
+                onnx_model.SerializeToString(), options, providers=['CPUExecutionProvider']
+            )
+            logger.info("Sentiment model running on ONNX Runtime")
+
+        except Exception as e:
+            logger.error("Error building ONNX session, using the numpy model: %s", e)
+
+    def _predict_proba_texts(self, processed_texts: List[str]) -> np.ndarray:
+        """Class probabilities for preprocessed texts"""
+        if self._onnx_session is None:
+            return self._predict_proba(self.vectorizer.transform(processed_texts))
+
+        # sklearn's default token pattern ignores single-character tokens; drop them to match
+        inputs = np.array(
+            [' '.join(token for token in text.split() if len(token) > 1) for text in processed_texts],
+            dtype=object
+        ).reshape(-1, 1)
+        return self._onnx_session.run(None, {'input': inputs})[1]
 
     def analyze_batch(self, texts: List[str]) -> List[Dict]:
         """Analyze sentiment for multiple texts"""
-        results = []
-        for text in texts:
-            sentiment = self.predict_sentiment(text)
-            results.append(sentiment)
-        return results
+        return self.predict_sentiment_batch(texts)
 
     def get_sentiment_summary(self, sentiments: List[Dict]) -> Dict:
         """Calculate summary statistics for sentiments"""
@@ -147,6 +274,8 @@ class SentimentAnalyzer:
                 model_data = pickle.load(f)
             self.model = model_data['model']
             self.vectorizer = model_data['vectorizer']
+            self._quantize_model()
+            self._build_onnx_session()
             self.is_trained = True
         except Exception as e:
-            logging.error(f"Error loading model: {e}")
\ No newline at end of file
+            logger.error("Error loading model: %s", e)
\ No newline at end of file
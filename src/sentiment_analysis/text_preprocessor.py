@@ -1,42 +1,42 @@
 import re
+import logging
 import nltk
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 from nltk.stem import WordNetLemmatizer
+from functools import lru_cache
 import string
 
+logger = logging.getLogger(__name__)
+
+# URLs, mentions/hashtags and any remaining non-letter character, stripped in a single pass
+# over lowercased text (alternatives are tried in order at each position)
+_CLEAN_RE = re.compile(r'http\S+|www\S+|[@#]\w+|[^a-z\s]')
+_PUNCTUATION = frozenset(string.punctuation)
+
 class TextPreprocessor:
     def __init__(self):
         self.download_nltk_data()
         self.stop_words = set(stopwords.words('english'))
         self.lemmatizer = WordNetLemmatizer()
+        # WordNet lookups dominate preprocessing and social text repeats words heavily
+        self._lemmatize = lru_cache(maxsize=50000)(self.lemmatizer.lemmatize)
 
     def download_nltk_data(self):
         """Download required NLTK data"""
         try:
-            nltk.download('punkt', quiet=True)
             nltk.download('stopwords', quiet=True)
             nltk.download('wordnet', quiet=True)
             nltk.download('vader_lexicon', quiet=True)
         except Exception as e:
-            print(f"Error downloading NLTK data: {e}")
+            logger.error("Error downloading NLTK data: %s", e)
 
     def clean_text(self, text: str) -> str:
         """Clean and preprocess text"""
         if not text:
             return ""
 
-        # Convert to lowercase
-        text = text.lower()
-
-        # Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-
-        # Remove user mentions and hashtags
-        text = re.sub(r'@\w+|#\w+', '', text)
-
-        # Remove special characters and numbers
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        # Lowercase, then remove URLs, mentions, hashtags, special characters and numbers
+        text = _CLEAN_RE.sub('', text.lower())
 
         # Remove extra whitespace
         text = ' '.join(text.split())
@@ -45,13 +45,14 @@ class TextPreprocessor:
 
     def tokenize_and_lemmatize(self, text: str) -> list:
         """Tokenize and lemmatize text"""
-        tokens = word_tokenize(text)
+        # clean_text leaves only lowercase letters and single spaces, so a plain split is exact
+        tokens = text.split()
 
         # Remove stopwords and punctuation
-        tokens = [token for token in tokens if token not in self.stop_words and token not in string.punctuation]
+        tokens = [token for token in tokens if token not in self.stop_words and token not in _PUNCTUATION]
 
         # Lemmatize
-        tokens = [self.lemmatizer.lemmatize(token) for token in tokens]
+        tokens = [self._lemmatize(token) for token in tokens]
 
         return tokens
 
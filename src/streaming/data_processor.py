@@ -2,29 +2,46 @@ from pyspark.sql import SparkSession
 from pyspark.sql.functions import *
 from pyspark.sql.types import *
 import logging
+import re
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
 import json
 
+logger = logging.getLogger(__name__)
+
+# Below this many posts, Spark's JVM round-trips cost far more than the work itself
+SPARK_MIN_BATCH_SIZE = 10000
+
+_HASHTAG_RE = re.compile(r'#(\w+)')
+
 class DataProcessor:
     def __init__(self):
-        self.spark = None
-        self.setup_spark()
+        # Spark (and its JVM) only starts when a batch is large enough to need it
+        self._spark = None
+
+    @property
+    def spark(self) -> SparkSession:
+        """Spark session, created on first use"""
+        if self._spark is None:
+            self.setup_spark()
+        return self._spark
 
     def setup_spark(self):
         """Initialize Spark session"""
         try:
-            self.spark = SparkSession.builder \
+            self._spark = SparkSession.builder \
                 .appName("SentimentAnalysisStreaming") \
                 .config("spark.sql.adaptive.enabled", "true") \
                 .config("spark.sql.adaptive.coalescePartitions.enabled", "true") \
+                .config("spark.sql.execution.arrow.pyspark.enabled", "true") \
                 .getOrCreate()
 
-            self.spark.sparkContext.setLogLevel("WARN")
-            logging.info("Spark session created successfully")
+            self._spark.sparkContext.setLogLevel("WARN")
+            logger.info("Spark session created successfully")
 
         except Exception as e:
-            logging.error(f"Error setting up Spark: {e}")
+            logger.error("Error setting up Spark: %s", e)
             raise
 
     def define_schema(self):
@@ -47,6 +64,9 @@ class DataProcessor:
             if not posts_data:
                 return []
 
+            if len(posts_data) < SPARK_MIN_BATCH_SIZE:
+                return self._process_small_batch(posts_data)
+
             # Convert to Spark DataFrame
             df = self.spark.createDataFrame(posts_data, schema=self.define_schema())
 
@@ -54,23 +74,54 @@ class DataProcessor:
             cleaned_df = df.filter(
                 (col("text").isNotNull()) &
                 (length(col("text")) > 10)  # Filter out very short posts
-            ).distinct()  # Remove duplicates
+            )  # Duplicates are collapsed by the (platform, id) upsert in MongoDB
 
             # Add processing metadata
             processed_df = cleaned_df.withColumn("processing_time", current_timestamp()) \
                                    .withColumn("text_length", length(col("text"))) \
                                    .withColumn("word_count", size(split(col("text"), " ")))
 
-            # Convert back to list of dictionaries
-            result = [row.asDict() for row in processed_df.collect()]
+            # Convert back to list of dictionaries; toPandas moves columnar Arrow batches instead of
+            # pickling Row objects, then nulls and numpy scalars go back to plain Python for BSON
+            processed_pdf = processed_df.toPandas()
+            result = processed_pdf.astype(object).where(processed_pdf.notna(), None).to_dict('records')
 
-            logging.info(f"Processed {len(result)} posts from {len(posts_data)} input posts")
+            logger.info("Processed %s posts from %s input posts", len(result), len(posts_data))
             return result
 
         except Exception as e:
-            logging.error(f"Error processing batch data: {e}")
+            logger.error("Error processing batch data: %s", e)
             return []
 
+    def _process_small_batch(self, posts_data: List[Dict]) -> List[Dict]:
+        """Filter, de-duplicate and annotate a small batch in plain Python"""
+        processing_time = datetime.now()
+        seen = set()
+        result = []
+
+        for post in posts_data:
+            text = post.get('text')
+            # Filter out very short posts
+            if not text or len(text) <= 10:
+                continue
+
+            # Remove duplicates
+            key = (post.get('platform'), post.get('id'))
+            if key in seen:
+                continue
+            seen.add(key)
+
+            # Copy so the raw post stored alongside the results is left untouched
+            result.append({
+                **post,
+                'processing_time': processing_time,
+                'text_length': len(text),
+                'word_count': text.count(' ') + 1
+            })
+
+        logger.info("Processed %s posts from %s input posts", len(result), len(posts_data))
+        return result
+
     def aggregate_sentiment_stats(self, sentiment_results: List[Dict]) -> Dict:
         """Aggregate sentiment statistics using Python"""
         try:
@@ -79,28 +130,18 @@ class DataProcessor:
 
             # Ensure we're working with a list
             if not isinstance(sentiment_results, list):
-                logging.error(f"Invalid input type: expected list, got {type(sentiment_results)}")
+                logger.error("Invalid input type: expected list, got %s", type(sentiment_results))
                 return {'positive': 0, 'neutral': 0, 'negative': 0, 'total': 0}
 
-            # Count sentiments using simple Python
-            counts = {'positive': 0, 'neutral': 0, 'negative': 0}
-
-            for result in sentiment_results:
-                if not isinstance(result, dict):
-                    logging.warning(f"Skipping non-dict item: {type(result)}")
-                    continue
-
-                sentiment_info = result.get('sentiment', {})
-                if not isinstance(sentiment_info, dict):
-                    logging.warning(f"Sentiment info is not a dict: {type(sentiment_info)}")
-                    continue
-
-                label = sentiment_info.get('label', 'neutral')
-                if label in counts:
-                    counts[label] += 1
+            # Count sentiments in one pass; malformed items are skipped
+            counts = Counter(
+                result['sentiment'].get('label', 'neutral')
+                for result in sentiment_results
+                if isinstance(result, dict) and isinstance(result.get('sentiment'), dict)
+            )
 
-            # Calculate percentages - explicitly convert to list to avoid dict_values issues
-            total = sum([counts['positive'], counts['neutral'], counts['negative']])
+            # Calculate percentages; labels outside the three classes are not counted
+            total = counts['positive'] + counts['neutral'] + counts['negative']
             stats = {
                 'positive': round(counts['positive'] / total * 100, 2) if total > 0 else 0,
                 'neutral': round(counts['neutral'] / total * 100, 2) if total > 0 else 0,
@@ -111,38 +152,71 @@ class DataProcessor:
             return stats
 
         except Exception as e:
-            logging.error(f"Error aggregating sentiment stats: {e}")
+            logger.error("Error aggregating sentiment stats: %s", e)
             return {'positive': 0, 'neutral': 0, 'negative': 0, 'total': 0}
 
-    def filter_trending_topics(self, posts_data: List[Dict], min_mentions: int = 5) -> List[str]:
-        """Identify trending topics from posts"""
+    def filter_trending_topics(self, posts_data: List[Dict], min_mentions: int = 5,
+                               top_n: Optional[int] = 20) -> List[str]:
+        """Identify the `top_n` most mentioned trending topics (all of them when top_n is None)"""
         try:
             if not posts_data:
                 return []
 
-            df = self.spark.createDataFrame(posts_data, schema=self.define_schema())
+            if len(posts_data) < SPARK_MIN_BATCH_SIZE:
+                hashtag_counts = Counter(
+                    hashtag
+                    for post in posts_data if post.get('text')
+                    for hashtag in _HASHTAG_RE.findall(post['text'])
+                )
+                trending_topics = [hashtag for hashtag, count in hashtag_counts.most_common(top_n)
+                                   if count >= min_mentions]
 
-            # Extract hashtags and mentions
-            hashtag_df = df.select(
-                explode(split(regexp_extract(col("text"), r'#(\w+)', 1), " ")).alias("hashtag")
-            ).filter(col("hashtag") != "")
+                logger.info("Found %s trending topics", len(trending_topics))
+                return trending_topics
 
-            # Count hashtag frequency
-            trending_df = hashtag_df.groupBy("hashtag").count() \
-                                  .filter(col("count") >= min_mentions) \
-                                  .orderBy(desc("count"))
+            trending_df = self._trending_df(posts_data, min_mentions)
+            if top_n is not None:
+                # Only the top rows reach the driver
+                trending_df = trending_df.limit(top_n)
 
             trending_topics = [row['hashtag'] for row in trending_df.collect()]
 
-            logging.info(f"Found {len(trending_topics)} trending topics")
+            logger.info("Found %s trending topics", len(trending_topics))
             return trending_topics
 
         except Exception as e:
-            logging.error(f"Error filtering trending topics: {e}")
+            logger.error("Error filtering trending topics: %s", e)
             return []
 
+    def iter_trending_topics(self, posts_data: List[Dict], min_mentions: int = 5) -> Iterator[str]:
+        """Yield trending topics, most mentioned first, streaming Spark rows to the driver as needed"""
+        if len(posts_data) < SPARK_MIN_BATCH_SIZE:
+            yield from self.filter_trending_topics(posts_data, min_mentions, top_n=None)
+            return
+
+        try:
+            for row in self._trending_df(posts_data, min_mentions).toLocalIterator():
+                yield row['hashtag']
+        except Exception as e:
+            logger.error("Error streaming trending topics: %s", e)
+
+    def _trending_df(self, posts_data: List[Dict], min_mentions: int):
+        """Spark DataFrame of hashtags with at least `min_mentions` mentions, most mentioned first"""
+        df = self.spark.createDataFrame(posts_data, schema=self.define_schema())
+
+        # Extract every hashtag in each post, as _HASHTAG_RE.findall does for small batches
+        hashtag_df = df.select(
+            explode(expr(r"regexp_extract_all(text, '#(\\w+)', 1)")).alias("hashtag")
+        )
+
+        # Count hashtag frequency
+        return hashtag_df.groupBy("hashtag").count() \
+                         .filter(col("count") >= min_mentions) \
+                         .orderBy(desc("count"))
+
     def stop_spark(self):
         """Stop Spark session"""
-        if self.spark:
-            self.spark.stop()
-            logging.info("Spark session stopped")
\ No newline at end of file
+        if self._spark:
+            self._spark.stop()
+            self._spark = None
+            logger.info("Spark session stopped")
\ No newline at end of file
@@ -1,9 +1,11 @@
+import asyncio
+import queue
 import threading
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict
-from concurrent.futures import ThreadPoolExecutor
 
 from src.data_collection.twitter_collector import TwitterCollector
 from src.data_collection.reddit_collector import RedditCollector
@@ -13,6 +15,8 @@ from src.database.mongodb_client import MongoDBClient
 from .data_processor import DataProcessor
 from config.settings import Config
 
+logger = logging.getLogger(__name__)
+
 class RealTimePipeline:
     def __init__(self):
         self.twitter_collector = TwitterCollector()
@@ -23,176 +27,219 @@ class RealTimePipeline:
         self.data_processor = DataProcessor()
 
         self.is_running = False
-        self.keywords = Config.DEFAULT_KEYWORDS
+        self._stop_event = threading.Event()
+        self.keywords = list(Config.DEFAULT_KEYWORDS)
         self.update_interval = Config.UPDATE_INTERVAL
 
-    def collect_data_from_all_sources(self) -> List[Dict]:
+    async def collect_data_from_all_sources(self) -> List[Dict]:
         """Collect data from all social media sources in parallel"""
         all_posts = []
 
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            # Submit collection tasks
-            twitter_future = executor.submit(
-                self.twitter_collector.collect_tweets,
+        results = await self.collect_all()
+
+        for source, posts in results.items():
+            if isinstance(posts, Exception):
+                logger.error("Error collecting %s data: %s", source, posts)
+                continue
+
+            all_posts.extend(posts)
+            logger.info("Collected %s %s posts", len(posts), source)
+
+        return all_posts
+
+    async def collect_all(self, timeout: float = 30) -> Dict[str, List[Dict]]:
+        """Run every collector concurrently; failures are returned as exceptions"""
+        sources = {
+            'Twitter': self.twitter_collector.collect_tweets_async(
                 self.keywords,
                 max_results=50
-            )
-
-            reddit_future = executor.submit(
-                self.reddit_collector.collect_posts,
+            ),
+            'Reddit': self.reddit_collector.collect_posts_async(
                 ['python', 'MachineLearning', 'artificial'],  # Example subreddits
                 self.keywords,
                 limit=50
-            )
-
-            youtube_future = executor.submit(
-                self.youtube_collector.search_videos,
+            ),
+            'YouTube': self.youtube_collector.search_videos_async(
                 self.keywords,
                 max_results=20
             )
+        }
 
-            # Collect results
-            try:
-                twitter_posts = twitter_future.result(timeout=30)
-                all_posts.extend(twitter_posts)
-                logging.info(f"Collected {len(twitter_posts)} Twitter posts")
-            except Exception as e:
-                logging.error(f"Error collecting Twitter data: {e}")
-
-            try:
-                reddit_posts = reddit_future.result(timeout=30)
-                all_posts.extend(reddit_posts)
-                logging.info(f"Collected {len(reddit_posts)} Reddit posts")
-            except Exception as e:
-                logging.error(f"Error collecting Reddit data: {e}")
-
-            try:
-                youtube_videos = youtube_future.result(timeout=30)
-                all_posts.extend(youtube_videos)
-                logging.info(f"Collected {len(youtube_videos)} YouTube videos")
-            except Exception as e:
-                logging.error(f"Error collecting YouTube data: {e}")
+        results = await asyncio.gather(
+            *(asyncio.wait_for(task, timeout) for task in sources.values()),
+            return_exceptions=True
+        )
 
-        return all_posts
+        return dict(zip(sources, results))
 
     def process_sentiment_batch(self, posts: List[Dict]) -> List[Dict]:
         """Process sentiment analysis for a batch of posts"""
         sentiment_results = []
 
         try:
-            # Use Spark for data preprocessing
             cleaned_posts = self.data_processor.process_batch_data(posts)
 
+            # Pair each post with its text, then score all texts in one batch
+            posts_with_text = []
             for post in cleaned_posts:
                 text = post.get('text', '') or post.get('title', '') or post.get('description', '')
-
                 if text:
-                    sentiment = self.sentiment_analyzer.predict_sentiment(text)
-
-                    result = {
-                        'post_id': post.get('id'),
-                        'platform': post.get('platform'),
-                        'text': text,
-                        'created_at': post.get('created_at'),
-                        'sentiment': sentiment,
-                        'processed_at': datetime.now(),
-                        'metadata': {
-                            'author_id': post.get('author_id') or post.get('author'),
-                            'likes': post.get('likes', 0),
-                            'retweets': post.get('retweets', 0),
-                            'score': post.get('score', 0)
-                        }
+                    posts_with_text.append((post, text))
+
+            sentiments = self.sentiment_analyzer.predict_sentiment_batch(
+                [text for _, text in posts_with_text]
+            )
+
+            # One timestamp per batch; every result in it shares the same processed_at
+            processed_at = datetime.now()
+
+            for (post, text), sentiment in zip(posts_with_text, sentiments):
+                result = {
+                    'post_id': post.get('id'),
+                    'platform': post.get('platform'),
+                    'text': text,
+                    'created_at': post.get('created_at'),
+                    'sentiment': sentiment,
+                    'processed_at': processed_at,
+                    'metadata': {
+                        'author_id': post.get('author_id') or post.get('author'),
+                        'likes': post.get('likes', 0),
+                        'retweets': post.get('retweets', 0),
+                        'score': post.get('score', 0)
                     }
-                    sentiment_results.append(result)
+                }
+                sentiment_results.append(result)
 
-            logging.info(f"Processed sentiment for {len(sentiment_results)} posts")
+            logger.info("Processed sentiment for %s posts", len(sentiment_results))
 
         except Exception as e:
-            logging.error(f"Error processing sentiment batch: {e}")
+            logger.error("Error processing sentiment batch: %s", e)
 
         return sentiment_results
 
     def store_results(self, raw_posts: List[Dict], sentiment_results: List[Dict]):
         """Store results in MongoDB"""
         try:
-            # Store raw posts
-            if raw_posts:
-                self.db_client.insert_raw_posts(raw_posts)
-
-            # Store sentiment results
-            if sentiment_results:
-                self.db_client.insert_sentiment_results(sentiment_results)
+            if raw_posts or sentiment_results:
+                self.db_client.store_cycle_batch(raw_posts, sentiment_results)
 
         except Exception as e:
-            logging.error(f"Error storing results: {e}")
-
-    def run_single_cycle(self):
-        """Run one cycle of the pipeline"""
-        try:
-            logging.info("Starting data collection cycle...")
+            logger.error("Error storing results: %s", e)
 
-            # Collect data from all sources
-            raw_posts = self.collect_data_from_all_sources()
+    def collector_worker(self, q_collected: queue.Queue):
+        """Stage 1: collect posts every `update_interval` seconds"""
+        # One loop for the life of the worker: asyncio.run would wait on collector
+        # threads that outlived their timeout before returning
+        executor = ThreadPoolExecutor(max_workers=6, thread_name_prefix='collector')
+        loop = asyncio.new_event_loop()
+        loop.set_default_executor(executor)
 
-            if raw_posts:
-                # Process sentiment analysis
-                sentiment_results = self.process_sentiment_batch(raw_posts)
-
-                # Store results in database
-                self.store_results(raw_posts, sentiment_results)
-
-                # Generate summary stats
-                stats = self.data_processor.aggregate_sentiment_stats(sentiment_results)
-                logging.info(f"Cycle completed. Sentiment distribution: {stats}")
-
-            else:
-                logging.info("No new posts collected in this cycle")
-
-        except Exception as e:
-            logging.error(f"Error in pipeline cycle: {e}")
+        try:
+            while self.is_running:
+                cycle_start = time.time()
 
-    def start_streaming(self):
-        """Start the real-time streaming pipeline"""
-        self.is_running = True
-        logging.info("Starting real-time sentiment analysis pipeline...")
+                try:
+                    logger.info("Starting data collection cycle...")
+                    raw_posts = loop.run_until_complete(self.collect_data_from_all_sources())
 
-        while self.is_running:
-            try:
-                cycle_start = time.time()
+                    if raw_posts:
+                        # Blocks while the downstream stages are behind
+                        q_collected.put(raw_posts)
+                    else:
+                        logger.info("No new posts collected in this cycle")
 
-                # Run one cycle
-                self.run_single_cycle()
+                except Exception as e:
+                    logger.error("Error collecting data: %s", e)
 
                 # Calculate sleep time to maintain interval
                 cycle_duration = time.time() - cycle_start
                 sleep_time = max(0, self.update_interval - cycle_duration)
 
                 if sleep_time > 0:
-                    logging.info(f"Cycle completed in {cycle_duration:.2f}s. Sleeping for {sleep_time:.2f}s")
-                    time.sleep(sleep_time)
+                    logger.info("Collection completed in %.2fs. Sleeping for %.2fs", cycle_duration, sleep_time)
+                    self._stop_event.wait(sleep_time)
                 else:
-                    logging.warning(f"Cycle took {cycle_duration:.2f}s, longer than interval {self.update_interval}s")
-
-            except KeyboardInterrupt:
-                logging.info("Pipeline stopped by user")
+                    logger.warning("Collection took %.2fs, longer than interval %ss", cycle_duration, self.update_interval)
+        finally:
+            executor.shutdown(wait=False)
+            loop.close()
+            q_collected.put(None)
+
+    def sentiment_worker(self, q_collected: queue.Queue, q_to_store: queue.Queue):
+        """Stage 2: score collected batches"""
+        try:
+            while True:
+                raw_posts = q_collected.get()
+                if raw_posts is None:
+                    break
+
+                try:
+                    sentiment_results = self.process_sentiment_batch(raw_posts)
+                    q_to_store.put((raw_posts, sentiment_results))
+
+                    # Generate summary stats
+                    stats = self.data_processor.aggregate_sentiment_stats(sentiment_results)
+                    logger.info("Cycle completed. Sentiment distribution: %s", stats)
+
+                except Exception as e:
+                    logger.error("Error in sentiment stage: %s", e)
+        finally:
+            q_to_store.put(None)
+
+    def db_worker(self, q_to_store: queue.Queue):
+        """Stage 3: write scored batches to MongoDB"""
+        while True:
+            item = q_to_store.get()
+            if item is None:
                 break
-            except Exception as e:
-                logging.error(f"Unexpected error in pipeline: {e}")
-                time.sleep(5)  # Brief pause before retrying
+
+            raw_posts, sentiment_results = item
+            self.store_results(raw_posts, sentiment_results)
+
+    def start_streaming(self):
+        """Start the real-time streaming pipeline"""
+        self.is_running = True
+        self._stop_event.clear()
+        logger.info("Starting real-time sentiment analysis pipeline...")
+
+        # Collection, scoring and storage run as separate stages so consecutive cycles overlap;
+        # bounded queues make a slow stage hold back the ones before it
+        q_collected = queue.Queue(maxsize=2)
+        q_to_store = queue.Queue(maxsize=2)
+
+        workers = [
+            threading.Thread(target=self.collector_worker, args=(q_collected,), name='collector_worker', daemon=True),
+            threading.Thread(target=self.sentiment_worker, args=(q_collected, q_to_store), name='sentiment_worker', daemon=True),
+            threading.Thread(target=self.db_worker, args=(q_to_store,), name='db_worker', daemon=True)
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            logger.info("Pipeline stopped by user")
+            self.is_running = False
+            self._stop_event.set()
+            # Let queued batches drain through to the database
+            for worker in workers:
+                worker.join()
 
         self.stop_streaming()
 
     def stop_streaming(self):
         """Stop the streaming pipeline"""
         self.is_running = False
+        self._stop_event.set()
         self.data_processor.stop_spark()
         self.db_client.close_connection()
-        logging.info("Streaming pipeline stopped")
+        logger.info("Streaming pipeline stopped")
 
     def update_keywords(self, new_keywords: List[str]):
         """Update the keywords being tracked"""
         self.keywords = new_keywords
-        logging.info(f"Updated keywords: {self.keywords}")
+        logger.info("Updated keywords: %s", self.keywords)
 
 # Example usage function
 def run_pipeline():
@@ -202,7 +249,7 @@ def run_pipeline():
     try:
         pipeline.start_streaming()
     except KeyboardInterrupt:
-        logging.info("Stopping pipeline...")
+        logger.info("Stopping pipeline...")
         pipeline.stop_streaming()
 
 if __name__ == "__main__":
@@ -1,28 +1,75 @@
 import logging
+import re
 import traceback
+from collections import OrderedDict
 from functools import wraps
 from typing import Dict, Any
 import time
 
+# Error keys tracked at once, and how long an error stays in the summary
+MAX_TRACKED_ERRORS = 1024
+ERROR_EXPIRY_SECONDS = 3600
+
+# Retry decisions for exception types that need no message inspection (checked along the MRO)
+_RETRY_BY_TYPE = {
+    TimeoutError: True,
+    ConnectionError: True,
+    PermissionError: False,
+}
+
+# Fallback classification from the error message, in a single scan
+_CATEGORY_RE = re.compile(
+    r'(?P<auth>unauthorized|forbidden|invalid credentials)'
+    r'|(?P<net>timeout|connection|network)'
+    r'|(?P<rate>rate limit|too many requests)',
+    re.I
+)
+# Retry network errors and rate limiting; never retry authentication errors.
+# Checked in this order when a message matches several categories
+_RETRY_BY_CATEGORY = {'net': True, 'rate': True, 'auth': False}
+
+class _LazyTraceback:
+    """Captures an exception's traceback and only formats it when it is read"""
+    __slots__ = ('_exception', '_text')
+
+    def __init__(self, error: Exception):
+        self._exception = traceback.TracebackException.from_exception(error, lookup_lines=False)
+        self._text = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = ''.join(self._exception.format())
+        return self._text
+
 class ErrorHandler:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.error_counts = {}
-        self.last_errors = {}
+        # Ordered oldest to most recent occurrence, so eviction and expiry pop from the front
+        self.last_errors = OrderedDict()
+        self._last_expire = 0.0
 
     def handle_api_error(self, api_name: str, error: Exception) -> Dict[str, Any]:
         """Handle API-related errors with retry logic"""
         error_key = f"{api_name}_{type(error).__name__}"
+        now = time.time()
+        self._expire_stale(now)
 
         # Track error frequency
         self.error_counts[error_key] = self.error_counts.get(error_key, 0) + 1
         self.last_errors[error_key] = {
-            'timestamp': time.time(),
+            'timestamp': now,
             'error': str(error),
-            'traceback': traceback.format_exc()
+            # Tracebacks are only kept (and formatted on demand) when DEBUG logging is on
+            'traceback': _LazyTraceback(error) if self.logger.isEnabledFor(logging.DEBUG) else None
         }
+        self.last_errors.move_to_end(error_key)
+
+        if len(self.last_errors) > MAX_TRACKED_ERRORS:
+            oldest_key, _ = self.last_errors.popitem(last=False)
+            self.error_counts.pop(oldest_key, None)
 
-        self.logger.error(f"API Error in {api_name}: {error}")
+        self.logger.error("API Error in %s: %s", api_name, error)
 
         # Determine if we should retry
         should_retry = self._should_retry(error, self.error_counts[error_key])
@@ -37,8 +84,9 @@ class ErrorHandler:
 
     def handle_database_error(self, operation: str, error: Exception) -> Dict[str, Any]:
         """Handle database-related errors"""
-        self.logger.error(f"Database Error in {operation}: {error}")
-        self.logger.debug(traceback.format_exc())
+        self.logger.error("Database Error in %s: %s", operation, error)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(traceback.format_exc())
 
         return {
             'success': False,
@@ -49,10 +97,10 @@ class ErrorHandler:
 
     def handle_processing_error(self, stage: str, error: Exception, data_context: Dict = None) -> Dict[str, Any]:
         """Handle data processing errors"""
-        self.logger.error(f"Processing Error in {stage}: {error}")
+        self.logger.error("Processing Error in %s: %s", stage, error)
 
-        if data_context:
-            self.logger.debug(f"Data context: {data_context}")
+        if data_context and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Data context: %s", data_context)
 
         return {
             'success': False,
@@ -69,17 +117,16 @@ class ErrorHandler:
         if error_count > 5:
             return False
 
-        # Retry for network-related errors
-        if any(term in str(error).lower() for term in ['timeout', 'connection', 'network']):
-            return True
+        # Known exception types decide directly
+        for error_type in type(error).__mro__:
+            decision = _RETRY_BY_TYPE.get(error_type)
+            if decision is not None:
+                return decision
 
-        # Retry for rate limiting
-        if any(term in str(error).lower() for term in ['rate limit', 'too many requests']):
-            return True
-
-        # Don't retry for authentication errors
-        if any(term in str(error).lower() for term in ['unauthorized', 'forbidden', 'invalid credentials']):
-            return False
+        categories = {match.lastgroup for match in _CATEGORY_RE.finditer(str(error))}
+        for category, decision in _RETRY_BY_CATEGORY.items():
+            if category in categories:
+                return decision
 
         # Default: retry for first few attempts
         return error_count <= 3
@@ -87,10 +134,12 @@ class ErrorHandler:
     def get_error_summary(self) -> Dict[str, Any]:
         """Get summary of recent errors"""
         recent_errors = {}
+        now = time.time()
+        self._expire_stale(now)
 
         for error_key, error_info in self.last_errors.items():
             # Only include errors from last hour
-            if time.time() - error_info['timestamp'] < 3600:
+            if now - error_info['timestamp'] < ERROR_EXPIRY_SECONDS:
                 recent_errors[error_key] = {
                     'count': self.error_counts.get(error_key, 0),
                     'last_occurrence': error_info['timestamp'],
@@ -99,6 +148,19 @@ class ErrorHandler:
 
         return recent_errors
 
+    def _expire_stale(self, now: float):
+        """Forget errors not seen for ERROR_EXPIRY_SECONDS; runs at most once a minute"""
+        if now - self._last_expire < 60:
+            return
+        self._last_expire = now
+
+        while self.last_errors:
+            error_key, error_info = next(iter(self.last_errors.items()))
+            if now - error_info['timestamp'] < ERROR_EXPIRY_SECONDS:
+                break
+            del self.last_errors[error_key]
+            self.error_counts.pop(error_key, None)
+
     def reset_error_counts(self):
         """Reset error counters (useful for periodic cleanup)"""
         self.error_counts.clear()
@@ -107,15 +169,18 @@ class ErrorHandler:
 def with_error_handling(error_handler: ErrorHandler, operation_name: str):
     """Decorator to add error handling to functions"""
     def decorator(func):
+        # Resolved once per decorated function rather than on every failure
+        module_logger = logging.getLogger(func.__module__)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
             except Exception as e:
-                error_result = error_handler.handle_processing_error(
-                    operation_name, e, {'args': str(args), 'kwargs': str(kwargs)}
-                )
-                logging.getLogger(func.__module__).error(f"Error in {func.__name__}: {e}")
+                # Call arguments are only kept as context when DEBUG logging would show them
+                data_context = {'args': args, 'kwargs': kwargs} if module_logger.isEnabledFor(logging.DEBUG) else None
+                error_result = error_handler.handle_processing_error(operation_name, e, data_context)
+                module_logger.error("Error in %s: %s", func.__name__, e)
                 return error_result
         return wrapper
     return decorator
@@ -1,53 +1,234 @@
+import atexit
 import logging
 import os
+import queue
+import threading
+import time
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from config.settings import Config
 
-def setup_logging(log_level=logging.INFO, log_dir='logs'):
+# Background thread that writes queued records to the real handlers
+_listener = None
+# Root handler feeding the listener's queue
+_queue_handler = None
+
+class FastFormatter(logging.Formatter):
+    """'%(asctime)s - %(name)s - %(levelname)s - %(message)s' with the date string rebuilt once per second"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        self._time_cache = (None, '')
+
+    def format(self, record):
+        second = int(record.created)
+        cached_second, date_str = self._time_cache
+        if second != cached_second:
+            date_str = time.strftime(self.default_time_format, self.converter(second))
+            self._time_cache = (second, date_str)
+
+        record.message = record.getMessage()
+        record.asctime = f"{date_str},{int(record.msecs):03d}"
+        s = f"{record.asctime} - {record.name} - {record.levelname} - {record.message}"
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            s = f"{s}\n{record.exc_text}"
+        if record.stack_info:
+            s = f"{s}\n{self.formatStack(record.stack_info)}"
+        return s
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that buffers writes, flushing on ERROR records and every `flush_interval` seconds.
+
+    The file size is only checked for rollover every `rollover_check_every` records or
+    `rollover_check_interval` seconds, so a file may overshoot maxBytes by a few records.
+    """
+
+    def __init__(self, filename, maxBytes=0, backupCount=0, buffer_size=64 * 1024, flush_interval=30.0,
+                 rollover_check_every=256, rollover_check_interval=5.0, **kwargs):
+        # Set before the base class opens the file
+        self.buffer_size = buffer_size
+        self._force_flush = True
+        self._closed = False
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, **kwargs)
+
+        self.flush_interval = flush_interval
+        self._flush_timer = None
+        self._schedule_flush()
+
+        self.rollover_check_every = rollover_check_every
+        self.rollover_check_interval = rollover_check_interval
+        self._records_since_check = 0
+        self._last_rollover_check = time.monotonic()
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+
+    def shouldRollover(self, record):
+        # The base check formats the record again and seeks to the end of the file
+        # (flushing the write buffer); rollover is rare, so only do that periodically
+        if self.maxBytes <= 0:
+            return False
+
+        self._records_since_check += 1
+        now = time.monotonic()
+        if (self._records_since_check < self.rollover_check_every
+                and now - self._last_rollover_check < self.rollover_check_interval):
+            return False
+
+        self._records_since_check = 0
+        self._last_rollover_check = now
+        return super().shouldRollover(record)
+
+    def emit(self, record):
+        # StreamHandler.emit flushes after every record; only errors go straight to disk
+        self._force_flush = record.levelno >= logging.ERROR
+        try:
+            super().emit(record)
+        finally:
+            self._force_flush = True
+
+    def flush(self):
+        if self._force_flush:
+            super().flush()
+
+    def _schedule_flush(self):
+        self._flush_timer = threading.Timer(self.flush_interval, self._periodic_flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _periodic_flush(self):
+        self.acquire()
+        try:
+            if self._closed:
+                return
+            self.flush()
+        finally:
+            self.release()
+        self._schedule_flush()
+
+    def close(self):
+        self.acquire()
+        try:
+            self._closed = True
+            if self._flush_timer:
+                self._flush_timer.cancel()
+        finally:
+            self.release()
+        super().close()
+
+def _stop_listener():
+    """Drain queued records and close the handlers owned by the listener"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+atexit.register(_stop_listener)
+
+def _before_fork():
+    """Empty the file buffers and hold every handler lock so the child inherits nothing half-written"""
+    if _listener is None:
+        return
+    for handler in _listener.handlers:
+        handler.acquire()
+        logging.StreamHandler.flush(handler)
+
+def _after_fork_in_parent():
+    if _listener is None:
+        return
+    for handler in reversed(_listener.handlers):
+        handler.release()
+
+def _after_fork_in_child():
+    """Start a listener of our own; threads don't survive fork (e.g. gunicorn preload_app workers)"""
+    global _listener
+    if _listener is None:
+        return
+
+    # logging has already reset the handler locks in the child. Records still queued
+    # belong to the parent, which writes them itself, so start from an empty queue
+    handlers = _listener.handlers
+    for handler in handlers:
+        if isinstance(handler, BufferedRotatingFileHandler):
+            handler._schedule_flush()
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler.queue = log_queue
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=_before_fork, after_in_parent=_after_fork_in_parent,
+                        after_in_child=_after_fork_in_child)
+
+def setup_logging(log_level=logging.INFO, log_dir='logs', buffer_size=64 * 1024):
     """Set up logging configuration for the application"""
+    global _listener, _queue_handler
+
+    # The formatter never uses thread, process or task names, so skip collecting them per record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging.logAsyncioTasks = False
+    if Config.FLASK_ENV == 'production':
+        # Don't print tracebacks for errors raised inside handlers
+        logging.raiseExceptions = False
 
     # Create logs directory if it doesn't exist
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
 
     # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    formatter = FastFormatter()
 
     # Set up root logger
     logger = logging.getLogger()
     logger.setLevel(log_level)
 
-    # Remove existing handlers
-    for handler in logger.handlers[:]:
-        logger.removeHandler(handler)
+    # Replace any existing handlers, including ones installed by an earlier basicConfig()
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers.clear()
+    _stop_listener()
 
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(log_level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
 
     # File handler for general logs
-    file_handler = RotatingFileHandler(
+    file_handler = BufferedRotatingFileHandler(
         os.path.join(log_dir, 'sentiment_analysis.log'),
         maxBytes=10*1024*1024,  # 10MB
-        backupCount=5
+        backupCount=5,
+        buffer_size=buffer_size
     )
     file_handler.setLevel(log_level)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
 
     # Error file handler
-    error_handler = RotatingFileHandler(
+    error_handler = BufferedRotatingFileHandler(
         os.path.join(log_dir, 'errors.log'),
         maxBytes=10*1024*1024,  # 10MB
-        backupCount=3
+        backupCount=3,
+        buffer_size=buffer_size
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(formatter)
-    logger.addHandler(error_handler)
+
+    # Log calls only enqueue the record; the listener thread formats and writes it
+    log_queue = queue.SimpleQueue()
+    _queue_handler = QueueHandler(log_queue)
+    logger.addHandler(_queue_handler)
+    _listener = QueueListener(log_queue, console_handler, file_handler, error_handler,
+                              respect_handler_level=True)
+    _listener.start()
 
     return logger
 
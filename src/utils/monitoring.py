@@ -1,76 +1,150 @@
 import time
 import psutil
 import logging
+from collections import deque
 from typing import Dict, Any
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
+from config.settings import Config
 
-@dataclass
+# (label, SystemMetrics field, critical above, warning above) for check_system_health
+_THRESHOLDS = (
+    ('CPU', 'cpu_percent', 90, 75),
+    ('memory', 'memory_percent', 90, 75),
+    ('disk', 'disk_usage', 95, 85),
+)
+
+@dataclass(frozen=True)
 class SystemMetrics:
+    __slots__ = ('timestamp', 'cpu_percent', 'memory_percent', 'disk_usage', 'network_sent', 'network_recv',
+                 'network_sent_per_sec', 'network_recv_per_sec')
     timestamp: datetime
     cpu_percent: float
     memory_percent: float
     disk_usage: float
-    network_sent: int
+    network_sent: int  # cumulative bytes
     network_recv: int
+    network_sent_per_sec: float  # bytes/s since the previous sample
+    network_recv_per_sec: float
+
+class _NullTimer:
+    """Stand-in for ProcessingTimer when monitoring is disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+_NULL_TIMER = _NullTimer()
 
 class PerformanceMonitor:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.metrics_history = []
-        self.start_time = time.time()
-        self.processing_times = []
+        self.enabled = not Config.DISABLE_MONITORING
+        # Every fresh sample from get_system_metrics, bounded to a day at one sample a minute
+        self.metrics_history = deque(maxlen=1440)
+        self.start_time = time.monotonic()
+        # Ring buffer of the last 100 measurements
+        self.processing_times = deque(maxlen=100)
+        # Running [total seconds, count] per operation, updated as times are logged
+        self._op_stats = {}
+
+        # cpu_percent(interval=None) reports usage since the previous call and returns a
+        # meaningless 0.0 the first time, so take that first sample now
+        if self.enabled:
+            psutil.cpu_percent(interval=None)
+
+        # Callers within _min_interval seconds of the last sample share it
+        self._last_metrics = None
+        self._last_metrics_ts = 0.0
+        self._min_interval = 2.0
+
+        # Disk usage changes slowly, so it is sampled less often than CPU and memory
+        self._disk_usage = None
+        self._disk_usage_ts = 0.0
+        self._disk_interval = 60.0
+
+        # Previous network counters, for per-second rates
+        self._last_network = None
+        self._last_network_ts = 0.0
 
     def get_system_metrics(self) -> SystemMetrics:
-        """Get current system performance metrics"""
+        """Get current system performance metrics (reused for up to _min_interval seconds)"""
+        if not self.enabled:
+            return None
+
+        now = time.monotonic()
+        if self._last_metrics is not None and now - self._last_metrics_ts < self._min_interval:
+            return self._last_metrics
+
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # Non-blocking: CPU usage since the previous sample
+            cpu_percent = psutil.cpu_percent(interval=None)
             memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            network = psutil.net_io_counters()
 
-            return SystemMetrics(
+            if self._disk_usage is None or now - self._disk_usage_ts >= self._disk_interval:
+                self._disk_usage = psutil.disk_usage('/').percent
+                self._disk_usage_ts = now
+
+            network = psutil.net_io_counters()
+            sent_per_sec = recv_per_sec = 0.0
+            if self._last_network is not None and now > self._last_network_ts:
+                elapsed = now - self._last_network_ts
+                # Counters can wrap or reset; report 0 rather than a negative rate
+                sent_per_sec = max(0, network.bytes_sent - self._last_network.bytes_sent) / elapsed
+                recv_per_sec = max(0, network.bytes_recv - self._last_network.bytes_recv) / elapsed
+            self._last_network = network
+            self._last_network_ts = now
+
+            metrics = SystemMetrics(
                 timestamp=datetime.now(),
                 cpu_percent=cpu_percent,
                 memory_percent=memory.percent,
-                disk_usage=disk.percent,
+                disk_usage=self._disk_usage,
                 network_sent=network.bytes_sent,
-                network_recv=network.bytes_recv
+                network_recv=network.bytes_recv,
+                network_sent_per_sec=sent_per_sec,
+                network_recv_per_sec=recv_per_sec
             )
+
+            self._last_metrics = metrics
+            self._last_metrics_ts = now
+            self.metrics_history.append(metrics)
+            return metrics
         except Exception as e:
             self.logger.error(f"Error getting system metrics: {e}")
             return None
 
-    def log_processing_time(self, operation: str, start_time: float, end_time: float):
-        """Log processing time for an operation"""
-        duration = end_time - start_time
+    def timer(self, operation_name: str):
+        """Context manager timing `operation_name`; does nothing when monitoring is disabled"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return ProcessingTimer(self, operation_name)
+
+    def log_processing_time(self, operation: str, start_ns: int, end_ns: int):
+        """Log processing time for an operation, given time.monotonic_ns() readings"""
+        duration = (end_ns - start_ns) / 1e9
         self.processing_times.append({
             'operation': operation,
             'duration': duration,
-            'timestamp': datetime.now()
+            'timestamp': time.time()  # epoch seconds; convert only if a consumer needs a datetime
         })
 
-        # Keep only last 100 measurements
-        if len(self.processing_times) > 100:
-            self.processing_times = self.processing_times[-100:]
+        stats = self._op_stats.setdefault(operation, [0.0, 0])
+        stats[0] += duration
+        stats[1] += 1
 
         self.logger.info(f"{operation} completed in {duration:.2f} seconds")
 
     def get_performance_summary(self) -> Dict[str, Any]:
         """Get performance summary"""
         current_metrics = self.get_system_metrics()
-        uptime = time.time() - self.start_time
-
-        # Calculate average processing times
-        avg_times = {}
-        for record in self.processing_times:
-            operation = record['operation']
-            if operation not in avg_times:
-                avg_times[operation] = []
-            avg_times[operation].append(record['duration'])
+        uptime = time.monotonic() - self.start_time
 
-        for operation in avg_times:
-            avg_times[operation] = sum(avg_times[operation]) / len(avg_times[operation])
+        # Average processing times from the running per-operation totals
+        avg_times = {operation: duration / count for operation, (duration, count) in self._op_stats.items()}
 
         return {
             'uptime_seconds': uptime,
@@ -81,11 +155,15 @@ class PerformanceMonitor:
                 'disk_usage': current_metrics.disk_usage if current_metrics else 0
             },
             'average_processing_times': avg_times,
-            'total_operations': len(self.processing_times)
+            'total_operations': sum(count for _, count in self._op_stats.values())
         }
 
     def check_system_health(self) -> Dict[str, Any]:
         """Check system health and return status"""
+        if not self.enabled:
+            return {'status': 'disabled', 'message': 'Monitoring is disabled',
+                    'issues': [], 'warnings': [], 'metrics': {}}
+
         metrics = self.get_system_metrics()
 
         if not metrics:
@@ -94,23 +172,13 @@ class PerformanceMonitor:
         issues = []
         warnings = []
 
-        # Check CPU usage
-        if metrics.cpu_percent > 90:
-            issues.append(f"High CPU usage: {metrics.cpu_percent}%")
-        elif metrics.cpu_percent > 75:
-            warnings.append(f"Elevated CPU usage: {metrics.cpu_percent}%")
-
-        # Check memory usage
-        if metrics.memory_percent > 90:
-            issues.append(f"High memory usage: {metrics.memory_percent}%")
-        elif metrics.memory_percent > 75:
-            warnings.append(f"Elevated memory usage: {metrics.memory_percent}%")
-
-        # Check disk usage
-        if metrics.disk_usage > 95:
-            issues.append(f"High disk usage: {metrics.disk_usage}%")
-        elif metrics.disk_usage > 85:
-            warnings.append(f"Elevated disk usage: {metrics.disk_usage}%")
+        # Check CPU, memory and disk usage against their thresholds
+        for name, field, critical, warning in _THRESHOLDS:
+            value = getattr(metrics, field)
+            if value > critical:
+                issues.append(f"High {name} usage: {value}%")
+            elif value > warning:
+                warnings.append(f"Elevated {name} usage: {value}%")
 
         if issues:
             status = 'critical'
@@ -127,7 +195,7 @@ class PerformanceMonitor:
             'message': message,
             'issues': issues,
             'warnings': warnings,
-            'metrics': metrics.__dict__
+            'metrics': asdict(metrics)
         }
 
 class ProcessingTimer:
@@ -138,11 +206,11 @@ class ProcessingTimer:
         self.start_time = None
 
     def __enter__(self):
-        self.start_time = time.time()
+        self.start_time = time.monotonic_ns()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        end_time = time.time()
+        end_time = time.monotonic_ns()
         self.monitor.log_processing_time(self.operation_name, self.start_time, end_time)
 
 # Global performance monitor instance